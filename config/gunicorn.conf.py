@@ -0,0 +1,22 @@
+"""
+Gunicorn settings for the production profile.
+
+WSGI with threads:  gunicorn -c config/gunicorn.conf.py config.wsgi
+ASGI with uvicorn:  GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+                    gunicorn -c config/gunicorn.conf.py config.asgi
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(
+    os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+)
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = timeout
+keepalive = 5
+max_requests = 1000
+max_requests_jitter = 100
+accesslog = "-"
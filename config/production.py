@@ -0,0 +1,48 @@
+"""
+Production settings: no debug tooling, persistent database connections
+with health checks, optionally behind PgBouncer transaction pooling.
+
+Select them with DJANGO_SETTINGS_MODULE=config.production.
+"""
+import os
+
+from config.settings import *  # noqa: F401, F403
+from config.settings import (
+    DATABASE_POOLER,
+    DATABASES,
+    INSTALLED_APPS,
+    MIDDLEWARE
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get("ALLOWED_HOSTS", "localhost").split(",")
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "debug_toolbar"]
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if not middleware.startswith("debug_toolbar.")
+]
+
+# Database connections
+# https://docs.djangoproject.com/en/5.0/ref/databases/#persistent-connections
+
+DATABASES = {
+    **DATABASES,
+    "default": {
+        **DATABASES["default"],
+        # Keep connections between requests of sync workers. Set to 0
+        # for ASGI workers, which open a connection per request thread,
+        # and let PgBouncer keep the server connections instead.
+        "CONN_MAX_AGE": int(os.environ.get("CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        # Named cursors of QuerySet.iterator() don't survive PgBouncer
+        # transaction pooling.
+        "DISABLE_SERVER_SIDE_CURSORS": bool(DATABASE_POOLER),
+        "OPTIONS": {
+            "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", 5)),
+        },
+    },
+}
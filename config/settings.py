@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 
@@ -32,6 +33,8 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+TESTING = sys.argv[1:2] == ["test"]
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -41,6 +44,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "debug_toolbar",
     "rest_framework",
     "drf_spectacular",
@@ -52,6 +56,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "station.middleware.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -95,8 +100,49 @@ DATABASES = {
     }
 }
 
+# Size of the database connection pool (PgBouncer default_pool_size in
+# production), used to report its saturation
+
+DATABASE_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 20))
+
+# Connection pooler in front of the database. With "pgbouncer" the pool
+# saturation comes from SHOW POOLS on its admin console, so the database
+# user has to be one of its stats_users
+
+DATABASE_POOLER = os.environ.get("DB_POOLER")
+
 AUTH_USER_MODEL = "user.User"
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    },
+    # Throttle counters, shared by all workers and hosts in production,
+    # see station.throttling
+    "throttle": {
+        "BACKEND": os.environ.get(
+            "THROTTLE_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("THROTTLE_CACHE_LOCATION", "throttle"),
+    },
+}
+
+REFERENCE_DATA_CACHE_TIMEOUT = int(
+    os.environ.get("REFERENCE_DATA_CACHE_TIMEOUT", 60 * 15)
+)
+
+# Seat holds, see station.models.SeatHold
+
+SEAT_HOLD_TIMEOUT = int(os.environ.get("SEAT_HOLD_TIMEOUT", 60 * 10))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -145,7 +191,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.ReadClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "station.permissions.IsAdminOrIfAuthenticatedReadOnly",
@@ -155,10 +201,33 @@ REST_FRAMEWORK = {
     ),
     "PAGE_SIZE": 7,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "station.throttling.SlidingWindowAnonRateThrottle",
+        "station.throttling.SlidingWindowUserRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "50/day", "user": "100/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.environ.get("THROTTLE_RATE_ANON", "50/day"),
+        "user": os.environ.get("THROTTLE_RATE_USER", "100/day"),
+    },
+}
+
+# Per-request SQL budgets, see station.middleware.QueryBudgetMiddleware
+
+QUERY_BUDGET_STRICT = bool(
+    os.environ.get("QUERY_BUDGET_STRICT", "1" if TESTING else "")
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "station.queries": {
+            "handlers": ["console"],
+            "level": os.environ.get("QUERY_LOG_LEVEL", "WARNING"),
+        },
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -178,4 +247,15 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
 }
+
+# Counts above it are estimated, see station.utils.estimates
+
+ESTIMATED_COUNT_THRESHOLD = int(
+    os.environ.get("ESTIMATED_COUNT_THRESHOLD", 10000)
+)
+
+# Users loaded by user.authentication.CachedJWTAuthentication
+
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", 60))
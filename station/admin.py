@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Q
 
 from station.models import (
     Crew,
@@ -7,27 +8,92 @@ from station.models import (
     Station,
     Route,
     Trip,
+    TripSchedule,
     Order,
     Ticket
 )
+from station.utils.estimates import EstimatedCountPaginator
 
-admin.site.register(Crew)
 admin.site.register(TrainType)
-admin.site.register(Station)
+
+
+class StationSearchMixin:
+    """
+    Search by station name with StationQuerySet.search(), served by the
+    trigram index, instead of icontains lookups no index can serve.
+    station_lookups are the station relations searched.
+    """
+
+    station_lookups = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+
+        stations = Station.objects.search(search_term.strip())
+        query = Q()
+        for lookup in self.station_lookups:
+            query |= Q(**{f"{lookup}__in": stations})
+
+        return queryset.filter(query), False
+
+
+class EstimatedCountMixin:
+    """Changelist without exact counts of large tables."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Crew)
+class CrewAdmin(admin.ModelAdmin):
+    search_fields = ("first_name", "last_name")
+
+
+@admin.register(Station)
+class StationAdmin(StationSearchMixin, admin.ModelAdmin):
+    search_fields = ("name",)
+    station_lookups = ("pk",)
 
 
 class TicketInLine(admin.TabularInline):
     model = Ticket
     extra = 1
+    autocomplete_fields = ("trip",)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        queryset = queryset.select_related(
+            "trip__route__source",
+            "trip__route__destination",
+            "trip__train"
+        )
+        return queryset
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == "trip":
+            # Labels of selected trips, one query per ticket row
+            kwargs["queryset"] = Trip.objects.select_related(
+                "route__source",
+                "route__destination",
+                "train"
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(EstimatedCountMixin, admin.ModelAdmin):
     inlines = (TicketInLine,)
+    list_display = ("id", "user", "created_at")
+    list_filter = ("created_at",)
+    list_select_related = ("user",)
+    search_fields = ("=user__email",)
+    raw_id_fields = ("user",)
 
 
 @admin.register(Train)
 class TrainAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
@@ -36,7 +102,10 @@ class TrainAdmin(admin.ModelAdmin):
 
 
 @admin.register(Route)
-class RouteAdmin(admin.ModelAdmin):
+class RouteAdmin(StationSearchMixin, admin.ModelAdmin):
+    autocomplete_fields = ("source", "destination")
+    search_fields = ("source__name", "destination__name")
+    station_lookups = ("source", "destination")
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
@@ -45,7 +114,13 @@ class RouteAdmin(admin.ModelAdmin):
 
 
 @admin.register(Trip)
-class TripAdmin(admin.ModelAdmin):
+class TripAdmin(StationSearchMixin, EstimatedCountMixin, admin.ModelAdmin):
+    list_display = ("__str__", "departure_time", "arrival_time")
+    list_filter = ("departure_time", "arrival_time")
+    autocomplete_fields = ("route", "train", "crew")
+    raw_id_fields = ("schedule",)
+    search_fields = ("route__source__name", "route__destination__name")
+    station_lookups = ("route__source", "route__destination")
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
@@ -55,3 +130,17 @@ class TripAdmin(admin.ModelAdmin):
             "train"
         )
         return queryset
+
+
+@admin.register(TripSchedule)
+class TripScheduleAdmin(admin.ModelAdmin):
+    filter_horizontal = ("crew",)
+    autocomplete_fields = ("route", "train")
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        queryset = queryset.select_related(
+            "route__source",
+            "route__destination"
+        )
+        return queryset
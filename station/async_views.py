@@ -0,0 +1,187 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from station.cache import CachedResponseMixin
+from station.paginations import CursorOrPageNumberPagination
+from station.views import StationViewSet, RouteViewSet, TripViewSet
+from user.authentication import ClaimsJWTAuthentication
+
+
+class AsyncViewSetView(View):
+    """
+    Async read-only view for one action of a DRF viewset. Reuses the
+    viewset queryset, permissions, throttles, pagination and serializers,
+    so responses match the sync endpoint, but loads rows with the async
+    ORM. Cursor pagination isn't supported.
+    """
+
+    viewset_class = None
+    action = None
+    http_method_names = ["get"]
+    authentication = ClaimsJWTAuthentication()
+    renderer = JSONRenderer()
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            viewset = await self.initialize_viewset(request, *args, **kwargs)
+            handler = getattr(self, self.action)
+
+            if isinstance(viewset, CachedResponseMixin):
+                data = await self.cached(viewset, handler)
+            else:
+                data = await handler(viewset)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+        return HttpResponse(
+            self.renderer.render(data),
+            content_type=self.renderer.media_type
+        )
+
+    async def initialize_viewset(self, request, *args, **kwargs):
+        drf_request = Request(request)
+
+        authenticated = await self.authentication.aauthenticate(request)
+        if authenticated is None:
+            raise exceptions.NotAuthenticated()
+        drf_request.user, drf_request.auth = authenticated
+
+        viewset = self.viewset_class(
+            request=drf_request,
+            args=args,
+            kwargs=kwargs,
+            action=self.action,
+            format_kwarg=None
+        )
+        viewset.check_permissions(drf_request)
+        await sync_to_async(viewset.check_throttles)(drf_request)
+        return viewset
+
+    async def cached(self, viewset, handler):
+        if viewset.request.user.is_staff:
+            return await handler(viewset)
+
+        key = await sync_to_async(viewset.get_cache_key)(viewset.request)
+        if (data := await cache.aget(key)) is not None:
+            return data
+
+        data = await handler(viewset)
+        await cache.aset(key, data, settings.REFERENCE_DATA_CACHE_TIMEOUT)
+        return data
+
+    async def list(self, viewset):
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        paginator = viewset.paginator
+
+        if paginator is None:
+            return viewset.get_serializer(
+                [instance async for instance in queryset.aiterator()],
+                many=True
+            ).data
+
+        if isinstance(paginator, CursorOrPageNumberPagination):
+            paginator = paginator.paginator
+
+        page = await self.paginate(paginator, queryset, viewset.request)
+        serializer = viewset.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data).data
+
+    async def paginate(self, paginator, queryset, request):
+        """Async counterpart of PageNumberPagination.paginate_queryset."""
+        django_paginator = paginator.django_paginator_class(
+            queryset, paginator.get_page_size(request)
+        )
+        # Counted (or estimated) off the event loop, then cached
+        await sync_to_async(getattr)(django_paginator, "count")
+
+        page_number = paginator.get_page_number(request, django_paginator)
+        try:
+            paginator.page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            raise exceptions.NotFound(
+                paginator.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+
+        paginator.page.object_list = [
+            instance
+            async for instance in paginator.page.object_list.aiterator()
+        ]
+        paginator.request = request
+        return list(paginator.page)
+
+    async def retrieve(self, viewset):
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+
+        try:
+            instance = await queryset.aget(
+                **{viewset.lookup_field: viewset.kwargs[lookup_url_kwarg]}
+            )
+        except (
+            queryset.model.DoesNotExist,
+            TypeError,
+            ValueError,
+            ValidationError
+        ):
+            raise exceptions.NotFound(
+                f"No {queryset.model._meta.object_name} "
+                f"matches the given query."
+            )
+
+        viewset.check_object_permissions(viewset.request, instance)
+        return viewset.get_serializer(instance).data
+
+    def handle_exception(self, exc):
+        data = (
+            exc.detail
+            if isinstance(exc.detail, (list, dict))
+            else {"detail": exc.detail}
+        )
+        response = HttpResponse(
+            self.renderer.render(data),
+            content_type=self.renderer.media_type,
+            status=exc.status_code
+        )
+
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response.headers["WWW-Authenticate"] = (
+                self.authentication.authenticate_header(None)
+            )
+        if wait := getattr(exc, "wait", None):
+            response.headers["Retry-After"] = str(int(wait))
+
+        return response
+
+
+class TripListAsyncView(AsyncViewSetView):
+    viewset_class = TripViewSet
+    query_budget = TripViewSet.query_budget
+    action = "list"
+
+
+class TripDetailAsyncView(AsyncViewSetView):
+    viewset_class = TripViewSet
+    query_budget = TripViewSet.query_budget
+    action = "retrieve"
+
+
+class RouteListAsyncView(AsyncViewSetView):
+    viewset_class = RouteViewSet
+    query_budget = RouteViewSet.query_budget
+    action = "list"
+
+
+class StationListAsyncView(AsyncViewSetView):
+    viewset_class = StationViewSet
+    query_budget = StationViewSet.query_budget
+    action = "list"
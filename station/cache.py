@@ -0,0 +1,232 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import F, Max
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date, quote_etag
+from rest_framework import mixins, status
+from rest_framework.response import Response
+
+
+def _generation_key(model):
+    return f"station:generation:{model._meta.label_lower}"
+
+
+def get_model_generation(model):
+    return cache.get_or_set(_generation_key(model), 0, timeout=None)
+
+
+def get_model_generations(models):
+    """Generations of several models with a single cache round trip."""
+    generations = cache.get_many([_generation_key(model) for model in models])
+    return [generations.get(_generation_key(model), 0) for model in models]
+
+
+def bump_model_generation(model):
+    """Increment the generation of model and return the new one."""
+    key = _generation_key(model)
+    cache.add(key, 0, timeout=None)
+    return cache.incr(key)
+
+
+def invalidate_model_cache(model):
+    """
+    Drop cached responses built from model rows. Runs right away and
+    again on commit, so a read racing the write can't cache stale rows.
+    """
+    bump_model_generation(model)
+    transaction.on_commit(lambda: bump_model_generation(model))
+
+
+def conditional_response(
+    request, etag, last_modified, handler, *args, **kwargs
+):
+    """
+    304 Not Modified when the request's validators match, otherwise the
+    handler's response. Both carry the ETag and Last-Modified headers.
+    """
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    ) or handler(request, *args, **kwargs)
+
+    if response.status_code in (
+        status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+    ):
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Serve responses from the cache for non-staff users. Entries are keyed
+    by the generation of cache_models, bumped on every save or delete.
+    The ETag and Last-Modified of a response are cached with its data, so
+    conditional requests are answered without a query too.
+    """
+
+    cache_models = ()
+
+    def get_cache_models(self):
+        return self.cache_models or (self.queryset.model,)
+
+    def get_cache_key(self, request):
+        generations = ":".join(
+            str(get_model_generation(model))
+            for model in self.get_cache_models()
+        )
+        return (
+            f"station:response:{self.basename}:{generations}:"
+            f"{request.get_full_path()}"
+        )
+
+    def cached(self, handler, request, *args, **kwargs):
+        if request.user.is_staff:
+            return handler(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        if (entry := cache.get(key)) is not None:
+            data, etag, last_modified = entry
+            if etag is None:
+                return Response(data)
+            return conditional_response(
+                request, etag, last_modified, lambda request: Response(data)
+            )
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            last_modified = response.headers.get("Last-Modified")
+            cache.set(
+                key,
+                (
+                    response.data,
+                    response.headers.get("ETag"),
+                    last_modified and parse_http_date(last_modified)
+                ),
+                settings.REFERENCE_DATA_CACHE_TIMEOUT
+            )
+        return response
+
+
+class CachedListModelMixin(CachedResponseMixin, mixins.ListModelMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveModelMixin(CachedResponseMixin, mixins.RetrieveModelMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalGetMixin(mixins.RetrieveModelMixin, mixins.ListModelMixin):
+    """
+    Answer If-None-Match and If-Modified-Since on list and retrieve with
+    304 Not Modified, before any row is loaded.
+
+    A detail is validated by the latest of its last_modified_fields, one
+    query through its primary key. A list by the latest updated_at of
+    every table behind last_modified_fields, one index lookup each, the
+    generations bumped by deletes from those tables and, for lists that
+    change with time, the next future value of every expiring_fields
+    path, so the ETag changes when a row drops out or a value expires.
+    Goes after the cached mixins, which keep the validators.
+    """
+
+    last_modified_fields = ("updated_at",)
+    expiring_fields = ()
+
+    def get_sources(self, paths):
+        """Distinct (model, field) the field paths end in."""
+        sources = []
+        for path in paths:
+            model = self.queryset.model
+            *relations, field = path.split("__")
+            for relation in relations:
+                model = model._meta.get_field(relation).related_model
+            sources.append((model, field))
+        return list(dict.fromkeys(sources))
+
+    def get_retrieve_freshness(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookups are not found, like get_object_or_404()
+            return None
+
+        fields = [F(field) for field in self.last_modified_fields]
+        last_modified = queryset.aggregate(
+            last_modified=Max(
+                Greatest(*fields) if len(fields) > 1 else fields[0]
+            )
+        )["last_modified"]
+        if last_modified is None:
+            return None
+
+        timestamp = last_modified.timestamp()
+        return quote_etag(f"{timestamp:.6f}"), timestamp
+
+    def get_list_freshness(self):
+        sources = self.get_sources(self.last_modified_fields)
+        now = timezone.now()
+        latest = [
+            model._base_manager.order_by(f"-{field}").values_list(field)
+            for model, field in sources
+        ] + [
+            model._base_manager
+            .filter(**{f"{field}__gt": now})
+            .order_by(field)
+            .values_list(field)
+            for model, field in self.get_sources(self.expiring_fields)
+        ]
+
+        selects, params = [], []
+        for queryset in latest:
+            sql, query_params = queryset[:1].query.sql_with_params()
+            selects.append(f"({sql})")
+            params.extend(query_params)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {', '.join(selects)}", params)
+            values = cursor.fetchone()
+
+        timestamps = [value.timestamp() if value else 0 for value in values]
+        generations = get_model_generations(
+            [model for model, field in sources]
+        )
+        etag = "-".join(
+            [str(generation) for generation in generations]
+            + [f"{timestamp:.6f}" for timestamp in timestamps]
+        )
+        return quote_etag(etag), max(timestamps[:len(sources)])
+
+    def conditional(self, handler, request, *args, **kwargs):
+        if self.action == "retrieve":
+            freshness = self.get_retrieve_freshness()
+            if freshness is None:
+                # No such object, let the handler answer 404
+                return handler(request, *args, **kwargs)
+        else:
+            freshness = self.get_list_freshness()
+
+        etag, timestamp = freshness
+        return conditional_response(
+            request,
+            etag,
+            int(timestamp),
+            handler,
+            *args,
+            **kwargs
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
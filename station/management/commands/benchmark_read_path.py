@@ -0,0 +1,111 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from station.models import Trip
+
+
+class Command(BaseCommand):
+    """
+    Django command that compares concurrent throughput of the sync read
+    endpoints under a WSGI server with the async ones under an ASGI server
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sync-url",
+            default="http://127.0.0.1:8000",
+            help="Base URL of the WSGI server.",
+        )
+        parser.add_argument(
+            "--async-url",
+            default="http://127.0.0.1:8001",
+            help="Base URL of the ASGI server.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Number of requests per endpoint.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Number of requests in flight.",
+        )
+        parser.add_argument(
+            "--email",
+            help="User to authenticate as, the first active user by default.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        users = get_user_model().objects.filter(is_active=True).order_by("id")
+        if options["email"]:
+            users = users.filter(email=options["email"])
+        if (user := users.first()) is None:
+            raise CommandError("No active user to authenticate as")
+
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        endpoints = [
+            ("trip-list", "async-trip-list", []),
+            ("route-list", "async-route-list", []),
+            ("station-list", "async-station-list", []),
+        ]
+        if trip_id := Trip.objects.values_list("id", flat=True).first():
+            endpoints.append(("trip-detail", "async-trip-detail", [trip_id]))
+
+        for sync_name, async_name, args in endpoints:
+            for mode, base_url, name in (
+                ("sync", options["sync_url"], sync_name),
+                ("async", options["async_url"], async_name),
+            ):
+                path = reverse(f"station:{name}", args=args)
+                rps, p50, p95, errors = self.benchmark(
+                    base_url + path,
+                    headers,
+                    options["requests"],
+                    options["concurrency"]
+                )
+                self.stdout.write(
+                    f"{mode:<6}{path:<36}{rps:>9.1f} req/s"
+                    f"{p50:>9.1f} ms p50{p95:>9.1f} ms p95"
+                    f"{errors:>6} errors"
+                )
+
+    @staticmethod
+    def benchmark(url, headers, requests, concurrency):
+        def fetch(_):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(
+                    urllib.request.Request(url, headers=headers)
+                ) as response:
+                    response.read()
+                    failed = False
+            except OSError:
+                failed = True
+            return (time.perf_counter() - start) * 1000, failed
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(fetch, range(requests)))
+        elapsed = time.perf_counter() - start
+
+        latencies = statistics.quantiles(
+            [latency for latency, _ in results], n=20
+        )
+        return (
+            requests / elapsed,
+            latencies[9],
+            latencies[18],
+            sum(failed for _, failed in results),
+        )
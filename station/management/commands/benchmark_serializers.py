@@ -0,0 +1,88 @@
+from timeit import repeat
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from station.models import Route, Trip
+from station.serializers.route_serializers import (
+    RouteListSerializer,
+    RouteListValuesSerializer
+)
+from station.serializers.trip_serializers import (
+    TripListSerializer,
+    TripListValuesSerializer
+)
+
+
+class Command(BaseCommand):
+    """
+    Django command that compares the time of serializing a page of trips
+    and routes with the list serializers and their values serializers
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100,
+            help="Number of rows in the page.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=200,
+            help="Number of times each page is serialized.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        rows = options["rows"]
+        cases = (
+            (
+                "trips",
+                Trip.objects.with_tickets_available().order_by("id")[:rows],
+                TripListSerializer,
+                TripListValuesSerializer,
+            ),
+            (
+                "routes",
+                Route.objects.select_related(
+                    "source", "destination"
+                )[:rows],
+                RouteListSerializer,
+                RouteListValuesSerializer,
+            ),
+        )
+
+        for name, queryset, serializer_class, values_class in cases:
+            instances = list(queryset)
+            values = list(values_class.values(queryset))
+            if not instances:
+                raise CommandError(f"No {name} to serialize")
+
+            renderer = JSONRenderer()
+            serializer_json = renderer.render(
+                serializer_class(instances, many=True).data
+            )
+            values_json = renderer.render(values_class(values).data)
+            if serializer_json != values_json:
+                raise CommandError(f"Values serializer of {name} differs")
+
+            serializer_time = min(repeat(
+                lambda: serializer_class(instances, many=True).data,
+                number=options["repeat"],
+                repeat=3,
+            ))
+            values_time = min(repeat(
+                lambda: values_class(values).data,
+                number=options["repeat"],
+                repeat=3,
+            ))
+
+            self.stdout.write(
+                f"{name}: {len(instances)} rows, "
+                f"serializer {serializer_time / options['repeat'] * 1e3:.2f}"
+                f" ms, values serializer "
+                f"{values_time / options['repeat'] * 1e3:.2f} ms "
+                f"({serializer_time / values_time:.1f}x faster)"
+            )
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from station.models import TripSchedule
+from station.utils.journey_planner import schedule_timetable_update
+
+
+class Command(BaseCommand):
+    """Django command that creates the missing trips of trip schedules"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Number of days ahead to create trips for.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        until = timezone.localdate() + timedelta(days=options["days"])
+
+        with transaction.atomic():
+            trips = TripSchedule.objects.expand(until)
+            schedule_timetable_update([trip.id for trip in trips])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(trips)} trips until {until}!"
+            )
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from station.models import SeatHold
+
+
+class Command(BaseCommand):
+    """Django command that releases expired seat holds in batches"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of holds released per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        batch_size = options["batch_size"]
+        released = 0
+
+        while True:
+            batch = SeatHold.objects.expired()[:batch_size].release()
+            released += batch
+            if batch < batch_size:
+                break
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Released {released} expired seat holds!")
+        )
@@ -0,0 +1,455 @@
+import csv
+import io
+import math
+import zipfile
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from station.cache import invalidate_model_cache
+from station.models import (
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Trip,
+    TripInventory
+)
+from station.utils.journey_planner import schedule_timetable_update
+
+ROUTE_TYPES = {
+    "0": "Tram",
+    "1": "Subway",
+    "2": "Rail",
+    "3": "Bus",
+    "4": "Ferry",
+    "5": "Cable tram",
+    "6": "Aerial lift",
+    "7": "Funicular",
+    "11": "Trolleybus",
+    "12": "Monorail",
+}
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+EARTH_RADIUS_KM = 6371
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def parse_gtfs_time(value):
+    """Seconds since the service day start, may be past 24:00:00."""
+    hours, minutes, seconds = map(int, value.split(":"))
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def distance_km(source, destination):
+    (lat1, lon1), (lat2, lon2) = (
+        map(math.radians, source), map(math.radians, destination)
+    )
+    half_chord = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return round(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(half_chord)))
+
+
+class GTFSFeed:
+    """Rows of the text files of a GTFS feed, unpacked or zipped."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise CommandError(f"GTFS feed {path} does not exist")
+
+    def has_file(self, name):
+        if zipfile.is_zipfile(self.path):
+            with zipfile.ZipFile(self.path) as archive:
+                return name in archive.namelist()
+        return (self.path / name).is_file()
+
+    @contextmanager
+    def rows(self, name):
+        with self.open_text(name) as file:
+            yield csv.DictReader(file)
+
+    @contextmanager
+    def open_text(self, name):
+        """Text file of the feed, errors of the caller aren't caught."""
+        if zipfile.is_zipfile(self.path):
+            with zipfile.ZipFile(self.path) as archive:
+                try:
+                    member = archive.open(name)
+                except KeyError:
+                    raise CommandError(f"GTFS feed has no {name}")
+
+                with io.TextIOWrapper(member, encoding="utf-8-sig") as file:
+                    yield file
+        else:
+            try:
+                text = open(
+                    self.path / name, encoding="utf-8-sig", newline=""
+                )
+            except FileNotFoundError:
+                raise CommandError(f"GTFS feed has no {name}")
+
+            with text as file:
+                yield file
+
+
+class Command(BaseCommand):
+    """
+    Django command that streams a GTFS feed into stations, trains, routes
+    and trips. Every file is read in batches upserted by GTFS ids, so
+    memory stays bounded by the batch size, except for the first and last
+    stop of each trip kept while reading stop_times.txt.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help="GTFS feed zip file or directory.",
+        )
+        parser.add_argument(
+            "--service-date",
+            type=date.fromisoformat,
+            default=None,
+            help="Date the trips run on, YYYY-MM-DD. Defaults to today.",
+        )
+        parser.add_argument(
+            "--timezone",
+            default=settings.TIME_ZONE,
+            help="Time zone of the stop times of the feed.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows upserted per query.",
+        )
+        parser.add_argument(
+            "--cargo-num",
+            type=int,
+            default=10,
+            help="Number of cargos of new trains.",
+        )
+        parser.add_argument(
+            "--places-in-cargo",
+            type=int,
+            default=20,
+            help="Number of places in a cargo of new trains.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        feed = GTFSFeed(options["path"])
+        self.batch_size = options["batch_size"]
+        self.service_date = (
+            options["service_date"] or timezone.localdate()
+        )
+        self.service_day = datetime.combine(
+            self.service_date,
+            time(),
+            tzinfo=ZoneInfo(options["timezone"])
+        )
+        self.train_defaults = {
+            "cargo_num": options["cargo_num"],
+            "places_in_cargo": options["places_in_cargo"],
+        }
+
+        self.read_services(feed)
+        with feed.rows("stops.txt") as rows:
+            self.timed("stops.txt", self.import_stops, rows)
+        with feed.rows("routes.txt") as rows:
+            self.timed("routes.txt", self.import_routes, rows)
+        with feed.rows("stop_times.txt") as rows:
+            self.timed("stop_times.txt", self.read_stop_times, rows)
+        with feed.rows("trips.txt") as rows:
+            self.timed("trips.txt", self.import_trips, rows)
+
+        invalidate_model_cache(Station)
+        invalidate_model_cache(TrainType)
+        invalidate_model_cache(Train)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported GTFS feed for {self.service_date}!"
+            )
+        )
+
+    def timed(self, name, handler, rows):
+        started = perf_counter()
+        count = handler(rows)
+        seconds = perf_counter() - started
+
+        self.stdout.write(
+            f"{name}: {count} rows in {seconds:.2f}s "
+            f"({count / max(seconds, 1e-6):.0f} rows/s)"
+        )
+
+    def read_services(self, feed):
+        """
+        Keep the service_ids running on the service date: the calendar
+        of the weekday, with the additions and removals of calendar_dates.
+        """
+        self.services = set()
+        calendars = [
+            (name, handler)
+            for name, handler in (
+                ("calendar.txt", self.read_calendar),
+                ("calendar_dates.txt", self.read_calendar_dates),
+            )
+            if feed.has_file(name)
+        ]
+        if not calendars:
+            raise CommandError(
+                "GTFS feed has no calendar.txt or calendar_dates.txt"
+            )
+
+        for name, handler in calendars:
+            with feed.rows(name) as rows:
+                self.timed(name, handler, rows)
+
+    def read_calendar(self, rows):
+        count = 0
+        weekday = WEEKDAYS[self.service_date.weekday()]
+        service_date = self.service_date.strftime("%Y%m%d")
+
+        for row in rows:
+            count += 1
+            if (
+                row[weekday] == "1"
+                and row["start_date"] <= service_date <= row["end_date"]
+            ):
+                self.services.add(row["service_id"])
+
+        return count
+
+    def read_calendar_dates(self, rows):
+        count = 0
+        service_date = self.service_date.strftime("%Y%m%d")
+
+        for row in rows:
+            count += 1
+            if row["date"] != service_date:
+                continue
+
+            if row["exception_type"] == "1":
+                self.services.add(row["service_id"])
+            elif row["exception_type"] == "2":
+                self.services.discard(row["service_id"])
+
+        return count
+
+    def import_stops(self, rows):
+        count = 0
+
+        for chunk in chunked(rows, self.batch_size):
+            count += len(chunk)
+            Station.objects.bulk_create(
+                [
+                    Station(
+                        gtfs_id=row["stop_id"],
+                        name=row["stop_name"][:63],
+                        latitude=float(row["stop_lat"]),
+                        longitude=float(row["stop_lon"]),
+                    )
+                    # Skip entrances, nodes and boarding areas
+                    for row in chunk
+                    if row.get("location_type", "") in ("", "0", "1")
+                ],
+                update_conflicts=True,
+                unique_fields=["gtfs_id"],
+                update_fields=["name", "latitude", "longitude", "updated_at"],
+            )
+
+        return count
+
+    def get_train_type(self, route_type):
+        name = ROUTE_TYPES.get(route_type, "Rail")
+        if name not in self.train_types:
+            self.train_types[name] = (
+                TrainType.objects.filter(name=name).first()
+                or TrainType.objects.create(name=name)
+            )
+        return self.train_types[name]
+
+    def import_routes(self, rows):
+        count = 0
+        self.train_types = {}
+
+        for chunk in chunked(rows, self.batch_size):
+            count += len(chunk)
+            Train.objects.bulk_create(
+                [
+                    Train(
+                        gtfs_id=row["route_id"],
+                        name=(
+                            row.get("route_short_name")
+                            or row.get("route_long_name")
+                            or row["route_id"]
+                        )[:63],
+                        train_type=self.get_train_type(row["route_type"]),
+                        **self.train_defaults,
+                    )
+                    for row in chunk
+                ],
+                update_conflicts=True,
+                unique_fields=["gtfs_id"],
+                update_fields=["name", "train_type", "updated_at"],
+            )
+
+        return count
+
+    def read_stop_times(self, rows):
+        """Keep the first departure and the last arrival of every trip."""
+        count = 0
+        self.trip_ends = {}
+
+        for row in rows:
+            count += 1
+            sequence = int(row["stop_sequence"])
+            first, last = self.trip_ends.get(
+                row["trip_id"], (None, None)
+            )
+
+            if first is None or sequence < first[0]:
+                first = (
+                    sequence,
+                    row["stop_id"],
+                    row["departure_time"] or row["arrival_time"]
+                )
+            if last is None or sequence > last[0]:
+                last = (
+                    sequence,
+                    row["stop_id"],
+                    row["arrival_time"] or row["departure_time"]
+                )
+
+            self.trip_ends[row["trip_id"]] = (first, last)
+
+        return count
+
+    def import_trips(self, rows):
+        count = 0
+
+        for chunk in chunked(rows, self.batch_size):
+            count += len(chunk)
+            with transaction.atomic():
+                self.import_trip_chunk([
+                    (row, *self.trip_ends[row["trip_id"]])
+                    for row in chunk
+                    if row["trip_id"] in self.trip_ends
+                    and row["service_id"] in self.services
+                ])
+
+        return count
+
+    def import_trip_chunk(self, trips):
+        stations = {
+            gtfs_id: (pk, (latitude, longitude))
+            for gtfs_id, pk, latitude, longitude in (
+                Station.objects
+                .filter(gtfs_id__in={
+                    stop_id
+                    for _, first, last in trips
+                    for stop_id in (first[1], last[1])
+                })
+                .values_list("gtfs_id", "id", "latitude", "longitude")
+            )
+        }
+        trains = dict(
+            Train.objects
+            .filter(gtfs_id__in={row["route_id"] for row, *_ in trips})
+            .values_list("gtfs_id", "id")
+        )
+        trips = [
+            (row, stations[first[1]], stations[last[1]], first, last)
+            for row, first, last in trips
+            if first[1] in stations
+            and last[1] in stations
+            and first[1] != last[1]
+            and row["route_id"] in trains
+        ]
+        routes = self.upsert_routes({
+            (source, destination)
+            for _, source, destination, *_ in trips
+        })
+
+        imported = Trip.objects.bulk_create(
+            [
+                Trip(
+                    gtfs_id=f"{row['trip_id']}:{self.service_date}",
+                    route_id=routes[source[0], destination[0]],
+                    train_id=trains[row["route_id"]],
+                    departure_time=self.service_day + timedelta(
+                        seconds=parse_gtfs_time(first[2])
+                    ),
+                    arrival_time=self.service_day + timedelta(
+                        seconds=parse_gtfs_time(last[2])
+                    ),
+                )
+                for row, source, destination, first, last in trips
+            ],
+            update_conflicts=True,
+            unique_fields=["gtfs_id"],
+            update_fields=[
+                "route",
+                "train",
+                "departure_time",
+                "arrival_time",
+                "updated_at"
+            ],
+        )
+
+        trip_ids = [trip.pk for trip in imported]
+        TripInventory.objects.sync(Trip.objects.filter(pk__in=trip_ids))
+        schedule_timetable_update(trip_ids)
+
+    def upsert_routes(self, pairs):
+        """Create missing routes between (id, location) station pairs."""
+        Route.objects.bulk_create(
+            [
+                Route(
+                    source_id=source[0],
+                    destination_id=destination[0],
+                    distance=distance_km(source[1], destination[1]),
+                )
+                for source, destination in pairs
+            ],
+            ignore_conflicts=True,
+        )
+
+        return {
+            (source_id, destination_id): pk
+            for pk, source_id, destination_id in (
+                Route.objects
+                .filter(
+                    source_id__in={source[0] for source, _ in pairs},
+                    destination_id__in={
+                        destination[0] for _, destination in pairs
+                    }
+                )
+                .values_list("id", "source_id", "destination_id")
+            )
+        }
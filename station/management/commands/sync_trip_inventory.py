@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from station.models import Trip, TripInventory
+
+
+class Command(BaseCommand):
+    """Django command that rebuilds or verifies trip seat inventory"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report out-of-sync trips, do not change anything.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        if options["check"]:
+            missing = Trip.objects.filter(inventory__isnull=True).count()
+            mismatched = list(
+                TripInventory.objects.mismatched().values_list(
+                    "trip_id", flat=True
+                )
+            )
+            if missing or mismatched:
+                raise CommandError(
+                    f"Trip inventory out of sync: {missing} missing, "
+                    f"{len(mismatched)} mismatched {mismatched}"
+                )
+            self.stdout.write(self.style.SUCCESS("Trip inventory in sync!"))
+            return
+
+        with transaction.atomic():
+            synced = TripInventory.objects.sync()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Trip inventory rebuilt for {synced} trips!")
+        )
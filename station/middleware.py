@@ -0,0 +1,226 @@
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async
+)
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger("station.queries")
+
+# Metrics of the request running in the current context. Async requests
+# share connections (and their execute wrappers) on the thread sensitive
+# executor, but each keeps its own context.
+request_metrics = ContextVar("request_metrics", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryMetrics:
+    """Database execute wrapper recording count, time and slowest query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            if duration >= self.slowest_duration:
+                self.slowest_duration = duration
+                self.slowest_sql = sql
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper of every connection, see request_metrics."""
+    metrics = request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+class QueryBudgetMiddleware:
+    """
+    Record the queries of every request, expose them in the Server-Timing
+    header and the station.queries log, and enforce the query_budget
+    ({action: max queries}) declared on DRF viewsets and async views.
+    Budget violations raise QueryBudgetExceeded when QUERY_BUDGET_STRICT
+    is set (tests) and are logged otherwise.
+
+    Queries of streaming responses run while the content is sent, after
+    the headers: the header counts the ones before, the log entry and
+    the budget check wait for the end of the stream and count them all.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        self.install_query_recorders()
+        metrics = QueryMetrics()
+        token = request_metrics.set(metrics)
+        start = time.perf_counter()
+
+        try:
+            response = self.get_response(request)
+        finally:
+            request_metrics.reset(token)
+
+        return self.process_metrics(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        # Connections are thread local, check the ones of the thread
+        # running the async ORM queries of this request.
+        await sync_to_async(self.install_query_recorders)()
+        metrics = QueryMetrics()
+        token = request_metrics.set(metrics)
+        start = time.perf_counter()
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_metrics.reset(token)
+
+        return self.process_metrics(request, response, metrics, start)
+
+    @staticmethod
+    def install_query_recorders():
+        """For connections opened before connection_created was hooked."""
+        for connection in connections.all():
+            install_query_recorder(connection)
+
+    def process_metrics(self, request, response, metrics, start):
+        total = time.perf_counter() - start
+        description = json.dumps(f"{metrics.count} queries")
+        response.headers["Server-Timing"] = ", ".join(
+            filter(None, [
+                response.headers.get("Server-Timing"),
+                f"db;dur={metrics.duration * 1000:.2f};desc={description}",
+                f"total;dur={total * 1000:.2f}",
+            ])
+        )
+
+        if not response.streaming:
+            self.check_metrics(request, response, metrics, start)
+        elif response.is_async:
+            response.streaming_content = self.arecord_stream(
+                response.streaming_content, request, response, metrics, start
+            )
+        else:
+            response.streaming_content = self.record_stream(
+                response.streaming_content, request, response, metrics, start
+            )
+        return response
+
+    def record_stream(self, content, request, response, metrics, start):
+        content = iter(content)
+        try:
+            while True:
+                token = request_metrics.set(metrics)
+                try:
+                    chunk = next(content)
+                except StopIteration:
+                    break
+                finally:
+                    request_metrics.reset(token)
+                yield chunk
+        finally:
+            self.check_metrics(request, response, metrics, start)
+
+    async def arecord_stream(self, content, request, response, metrics, start):
+        content = aiter(content)
+        try:
+            while True:
+                token = request_metrics.set(metrics)
+                try:
+                    chunk = await anext(content)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    request_metrics.reset(token)
+                yield chunk
+        finally:
+            self.check_metrics(request, response, metrics, start)
+
+    def check_metrics(self, request, response, metrics, start):
+        """Log the queries of the request and enforce its budget."""
+        total = time.perf_counter() - start
+        view, action, budget = getattr(
+            request, "query_budget_tags", (None, None, None)
+        )
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "view": view,
+                "action": action,
+                "queries": metrics.count,
+                "db_ms": round(metrics.duration * 1000, 2),
+                "total_ms": round(total * 1000, 2),
+                "slowest_query_ms": round(
+                    metrics.slowest_duration * 1000, 2
+                ),
+                "slowest_query": metrics.slowest_sql,
+            }))
+
+        if budget is not None and metrics.count > budget:
+            message = (
+                f"{view}.{action} ran {metrics.count} queries, "
+                f"budget is {budget}"
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "cls", None) or getattr(
+            view_func, "view_class", None
+        )
+        if view_class is None:
+            return None
+
+        method = request.method.lower()
+        actions = getattr(view_func, "actions", None) or {}
+        action = (
+            actions.get(method) or getattr(view_class, "action", None)
+            or method
+        )
+        request.query_budget_tags = (
+            view_class.__name__,
+            action,
+            getattr(view_class, "query_budget", {}).get(action),
+        )
+        return None
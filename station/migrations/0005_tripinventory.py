@@ -0,0 +1,49 @@
+# Generated by Django 5.0.3 on 2026-10-18 01:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def populate_trip_inventory(apps, schema_editor):
+    Trip = apps.get_model("station", "Trip")
+    TripInventory = apps.get_model("station", "TripInventory")
+
+    TripInventory.objects.bulk_create(
+        [
+            TripInventory(
+                trip_id=trip["id"],
+                tickets_sold=trip["sold"],
+                tickets_available=trip["capacity"] - trip["sold"],
+            )
+            for trip in Trip.objects.annotate(
+                sold=Count("tickets"),
+                capacity=F("train__cargo_num") * F("train__places_in_cargo"),
+            ).values("id", "sold", "capacity").iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0004_alter_traintype_options_alter_route_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TripInventory',
+            fields=[
+                ('trip', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='inventory', serialize=False, to='station.trip')),
+                ('tickets_sold', models.PositiveIntegerField(default=0)),
+                ('tickets_available', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Trip Inventories',
+            },
+        ),
+        migrations.RunPython(
+            populate_trip_inventory, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-18 01:39
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import (
+    TrigramExtension,
+    UnaccentExtension,
+)
+import django.db.models.functions.text
+import station.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0005_tripinventory'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.RunSQL(
+            sql=(
+                "CREATE OR REPLACE FUNCTION station_unaccent(text) "
+                "RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+                "AS $$ SELECT public.unaccent('public.unaccent', $1) $$;"
+            ),
+            reverse_sql="DROP FUNCTION IF EXISTS station_unaccent(text);",
+        ),
+        migrations.AddIndex(
+            model_name='station',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(station.models.ImmutableUnaccent('name')), name='gin_trgm_ops'), name='station_name_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-18 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0007_trip_order_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['route', 'departure_time'], name='trip_route_departure_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['arrival_time'], name='trip_arrival_time_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.3 on 2026-10-18 02:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_trip_cargos(apps, schema_editor):
+    Trip = apps.get_model("station", "Trip")
+    TripCargo = apps.get_model("station", "TripCargo")
+
+    TripCargo.objects.bulk_create(
+        (
+            TripCargo(trip_id=trip_id, number=number)
+            for trip_id, cargo_num in Trip.objects.values_list(
+                "id", "train__cargo_num"
+            ).iterator()
+            for number in range(1, cargo_num + 1)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0009_seathold_tripinventory_tickets_held'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TripCargo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('trip', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cargos', to='station.trip')),
+            ],
+            options={
+                'ordering': ['number'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tripcargo',
+            constraint=models.UniqueConstraint(fields=('trip', 'number'), name='unique_trip_cargo_number'),
+        ),
+        migrations.RunPython(
+            populate_trip_cargos, migrations.RunPython.noop
+        ),
+    ]
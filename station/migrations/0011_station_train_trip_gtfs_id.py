@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-18 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0010_tripcargo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='station',
+            name='gtfs_id',
+            field=models.CharField(blank=True, help_text='GTFS stop_id of imported stations.', max_length=255, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='train',
+            name='gtfs_id',
+            field=models.CharField(blank=True, help_text='GTFS route_id of imported trains.', max_length=255, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='gtfs_id',
+            field=models.CharField(blank=True, help_text='GTFS trip_id and service date of imported trips.', max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.3 on 2026-10-18 02:38
+
+import django.contrib.postgres.fields
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0011_station_train_trip_gtfs_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TripSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekdays', django.contrib.postgres.fields.ArrayField(base_field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(7)]), default=list, help_text='ISO weekdays the trip departs on, 1 is Monday.', size=None)),
+                ('departure_time', models.TimeField()),
+                ('arrival_time', models.TimeField()),
+                ('arrival_days', models.PositiveSmallIntegerField(default=0, help_text='Days between the departure and the arrival.')),
+                ('valid_from', models.DateField()),
+                ('valid_until', models.DateField(blank=True, null=True)),
+                ('crew', models.ManyToManyField(blank=True, related_name='schedules', to='station.crew')),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='station.route')),
+                ('train', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='station.train')),
+            ],
+            options={
+                'verbose_name_plural': 'Trip Schedules',
+            },
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trips', to='station.tripschedule'),
+        ),
+        migrations.AddConstraint(
+            model_name='trip',
+            constraint=models.UniqueConstraint(fields=('schedule', 'departure_time'), name='unique_schedule_departure_time'),
+        ),
+    ]
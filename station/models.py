@@ -1,6 +1,25 @@
+import datetime
+from collections import Counter
+
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramSimilarity
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import (
+    F,
+    Q,
+    Case,
+    Count,
+    OuterRef,
+    Subquery,
+    Value,
+    When
+)
+from django.db.models.functions import Coalesce, Upper
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 
@@ -21,6 +40,7 @@ class Crew(models.Model):
         choices=CrewPosition,
         default=CrewPosition.OTHER
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     @property
     def full_name(self):
@@ -32,6 +52,7 @@ class Crew(models.Model):
 
 class TrainType(models.Model):
     name = models.CharField(max_length=63)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name_plural = "Train Types"
@@ -49,6 +70,14 @@ class Train(models.Model):
         on_delete=models.PROTECT,
         related_name="trains"
     )
+    gtfs_id = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="GTFS route_id of imported trains."
+    )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     @property
     def capacity(self):
@@ -58,10 +87,65 @@ class Train(models.Model):
         return f"Train: {self.name}. Type: {self.train_type}"
 
 
+class ImmutableUnaccent(models.Func):
+    """unaccent() wrapper declared IMMUTABLE, so it can be indexed."""
+
+    function = "station_unaccent"
+    output_field = models.TextField()
+
+
+def search_name(expression):
+    return Upper(ImmutableUnaccent(expression))
+
+
+class StationQuerySet(models.QuerySet):
+
+    def search(self, name, fuzzy=False):
+        """
+        Case and accent insensitive substring match on station name
+        served by the trigram index. With fuzzy=True stations with
+        similar names (typos) match as well.
+        """
+        queryset = self.alias(search_name=search_name("name"))
+        term = search_name(models.Value(name))
+        name_filter = Q(search_name__contains=term)
+
+        if fuzzy:
+            name_filter |= Q(search_name__trigram_word_similar=term)
+
+        return queryset.filter(name_filter)
+
+    def rank_by_similarity(self, name):
+        return self.annotate(
+            rank=TrigramSimilarity(
+                search_name("name"),
+                search_name(models.Value(name)),
+            )
+        ).order_by("-rank", "name")
+
+
 class Station(models.Model):
     name = models.CharField(max_length=63)
     latitude = models.FloatField()
     longitude = models.FloatField()
+    gtfs_id = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="GTFS stop_id of imported stations."
+    )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = StationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(search_name("name"), name="gin_trgm_ops"),
+                name="station_name_trgm_idx"
+            )
+        ]
 
     def __str__(self) -> str:
         return f"Station {self.name} ({self.latitude}, {self.longitude})"
@@ -79,6 +163,7 @@ class Route(models.Model):
         related_name="destination_routes"
     )
     distance = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         constraints = [
@@ -93,6 +178,39 @@ class Route(models.Model):
         return f"{self.source.name} - {self.destination.name}"
 
 
+class TripQuerySet(models.QuerySet):
+
+    def with_tickets_available(self):
+        """
+        Annotate tickets_available from the inventory. Seats of holds
+        that expired but weren't released by expire_seat_holds yet are
+        added back, the inventory still counts them as held.
+        """
+        expired_holds = (
+            SeatHold.objects
+            .expired()
+            .filter(trip=OuterRef("pk"))
+            .order_by()
+            .annotate(
+                count=models.Func(
+                    "id",
+                    function="COUNT",
+                    output_field=models.IntegerField()
+                )
+            )
+            .values("count")
+        )
+        return self.select_related(
+            "route__source",
+            "route__destination",
+            "train"
+        ).annotate(
+            tickets_available=(
+                F("inventory__tickets_available") + Subquery(expired_holds)
+            )
+        )
+
+
 class Trip(models.Model):
     route = models.ForeignKey(
         Route,
@@ -110,11 +228,185 @@ class Trip(models.Model):
         Crew,
         related_name="trips"
     )
+    gtfs_id = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="GTFS trip_id and service date of imported trips."
+    )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    schedule = models.ForeignKey(
+        "TripSchedule",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="trips"
+    )
+
+    objects = TripQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["schedule", "departure_time"],
+                name="unique_schedule_departure_time"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["departure_time", "id"],
+                name="trip_departure_time_id_idx"
+            ),
+            models.Index(
+                fields=["route", "departure_time"],
+                name="trip_route_departure_time_idx"
+            ),
+            models.Index(
+                fields=["arrival_time"],
+                name="trip_arrival_time_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Route: {self.route}. Train: {self.train.name}"
 
 
+class TripScheduleQuerySet(models.QuerySet):
+
+    def expand(self, until, since=None):
+        """
+        Bulk create the missing trips of the schedules departing from
+        since (today by default) to until, with their crew. Returns the
+        created trips.
+        """
+        since = since or timezone.localdate()
+        created = []
+
+        for schedule in self.prefetch_related("crew"):
+            departures = schedule.departures(since, until)
+            if not departures:
+                continue
+
+            existing = set(
+                schedule.trips
+                .filter(departure_time__range=(
+                    departures[0][0], departures[-1][0]
+                ))
+                .values_list("departure_time", flat=True)
+            )
+            trips = Trip.objects.bulk_create(
+                Trip(
+                    route_id=schedule.route_id,
+                    train_id=schedule.train_id,
+                    schedule=schedule,
+                    departure_time=departure_time,
+                    arrival_time=arrival_time,
+                )
+                for departure_time, arrival_time in departures
+                if departure_time not in existing
+            )
+            Trip.crew.through.objects.bulk_create(
+                Trip.crew.through(trip_id=trip.id, crew_id=crew.id)
+                for trip in trips
+                for crew in schedule.crew.all()
+            )
+            created += trips
+
+        if created:
+            TripInventory.objects.sync(
+                Trip.objects.filter(pk__in=[trip.pk for trip in created])
+            )
+
+        return created
+
+
+class TripSchedule(models.Model):
+    """
+    Template of a trip running on the same weekdays at the same local
+    times, expanded into Trip rows for the days ahead.
+    """
+    route = models.ForeignKey(
+        Route,
+        on_delete=models.CASCADE,
+        related_name="schedules"
+    )
+    train = models.ForeignKey(
+        Train,
+        on_delete=models.CASCADE,
+        related_name="schedules"
+    )
+    crew = models.ManyToManyField(
+        Crew,
+        related_name="schedules",
+        blank=True
+    )
+    weekdays = ArrayField(
+        models.PositiveSmallIntegerField(
+            validators=[MinValueValidator(1), MaxValueValidator(7)]
+        ),
+        default=list,
+        help_text="ISO weekdays the trip departs on, 1 is Monday."
+    )
+    departure_time = models.TimeField()
+    arrival_time = models.TimeField()
+    arrival_days = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Days between the departure and the arrival."
+    )
+    valid_from = models.DateField()
+    valid_until = models.DateField(null=True, blank=True)
+
+    objects = TripScheduleQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "Trip Schedules"
+
+    def clean(self):
+        if (
+            self.arrival_days == 0
+            and self.arrival_time <= self.departure_time
+        ):
+            raise ValidationError({
+                "arrival_time": _(
+                    "Arrival must be after departure, "
+                    "set arrival days for overnight trips."
+                )
+            })
+        if self.valid_until and self.valid_until < self.valid_from:
+            raise ValidationError({
+                "valid_until": _("Schedule must end after it starts.")
+            })
+
+    def departures(self, since, until):
+        """Local (departure, arrival) datetimes of runs from since to until."""
+        since = max(since, self.valid_from)
+        if self.valid_until:
+            until = min(until, self.valid_until)
+
+        return [
+            (
+                timezone.make_aware(
+                    datetime.datetime.combine(day, self.departure_time)
+                ),
+                timezone.make_aware(
+                    datetime.datetime.combine(
+                        day + datetime.timedelta(days=self.arrival_days),
+                        self.arrival_time
+                    )
+                ),
+            )
+            for day in (
+                since + datetime.timedelta(days=offset)
+                for offset in range((until - since).days + 1)
+            )
+            if day.isoweekday() in self.weekdays
+        ]
+
+    def __str__(self) -> str:
+        return f"Schedule: {self.route} at {self.departure_time}"
+
+
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
@@ -124,6 +416,16 @@ class Order(models.Model):
     )
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "id"],
+                name="order_user_created_at_id_idx"
+            ),
+            models.Index(
+                fields=["-created_at", "id"],
+                name="order_created_at_id_idx"
+            )
+        ]
         ordering = ["-created_at"]
 
     def __str__(self):
@@ -194,3 +496,273 @@ class Ticket(models.Model):
         return (
             f"{self.trip} (cargo: {self.cargo}, seat: {self.seat})"
         )
+
+
+def seats_filter(seats):
+    """Build a filter matching any of the (trip_id, cargo, seat) tuples."""
+    query = Q()
+    for trip_id, cargo, seat in seats:
+        query |= Q(trip_id=trip_id, cargo=cargo, seat=seat)
+    return query
+
+
+class SeatHoldQuerySet(models.QuerySet):
+
+    def active(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+    def release(self):
+        """
+        Delete the holds of this queryset which are not locked by
+        another transaction and give their seats back to the inventory.
+        Returns the number of released holds.
+        """
+        with transaction.atomic(savepoint=False):
+            holds = dict(
+                self.select_for_update(skip_locked=True)
+                .values_list("id", "trip_id")
+            )
+            if not holds:
+                return 0
+
+            SeatHold.objects.filter(id__in=holds).delete()
+            released = Counter(holds.values())
+            TripInventory.objects.record_holds(
+                {trip_id: -count for trip_id, count in released.items()}
+            )
+
+        return len(holds)
+
+
+class SeatHold(models.Model):
+    """
+    Short-lived reservation of a seat during checkout. Expired holds
+    stop blocking the seat immediately and are removed in batches by
+    the expire_seat_holds command.
+    """
+    cargo = models.PositiveIntegerField()
+    seat = models.PositiveIntegerField()
+    trip = models.ForeignKey(
+        Trip,
+        on_delete=models.CASCADE,
+        related_name="holds"
+    )
+    user = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    expires_at = models.DateTimeField()
+
+    objects = SeatHoldQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["trip", "cargo", "seat"],
+                name="unique_hold_trip_cargo_seat"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["expires_at"],
+                name="seathold_expires_at_idx"
+            )
+        ]
+        ordering = ["expires_at"]
+
+    def __str__(self):
+        return f"{self.trip}: cargo {self.cargo}, seat {self.seat}"
+
+
+def _count_by_trip(model):
+    count = (
+        model.objects
+        .filter(trip=OuterRef("trip"))
+        .order_by()
+        .values("trip")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    return Coalesce(Subquery(count), 0)
+
+
+def _sold_tickets_count():
+    return _count_by_trip(Ticket)
+
+
+def _held_seats_count():
+    return _count_by_trip(SeatHold)
+
+
+class TripInventoryManager(models.Manager):
+
+    def _record(self, counter, deltas_by_trip):
+        deltas_by_trip = {
+            trip_id: delta
+            for trip_id, delta in deltas_by_trip.items()
+            if delta
+        }
+        if not deltas_by_trip:
+            return
+
+        delta = Case(
+            *[
+                When(trip_id=trip_id, then=Value(delta))
+                for trip_id, delta in deltas_by_trip.items()
+            ],
+            output_field=models.IntegerField(),
+        )
+        self.filter(trip_id__in=deltas_by_trip).update(
+            **{counter: F(counter) + delta},
+            tickets_available=F("tickets_available") - delta,
+            updated_at=timezone.now(),
+        )
+
+    def record_sales(self, sold_by_trip):
+        """
+        Apply sold ticket deltas ({trip_id: delta}) to the counters
+        of all affected trips with a single UPDATE.
+        """
+        self._record("tickets_sold", sold_by_trip)
+
+    def touch(self, trip_ids):
+        """Mark trips changed whose tickets changed without a count."""
+        self.filter(trip_id__in=trip_ids).update(updated_at=timezone.now())
+
+    def record_holds(self, held_by_trip):
+        """
+        Apply seat hold deltas ({trip_id: delta}) to the counters
+        of all affected trips with a single UPDATE.
+        """
+        self._record("tickets_held", held_by_trip)
+
+    def with_actual_sold(self):
+        return self.annotate(
+            actual_sold=_sold_tickets_count(),
+            actual_held=_held_seats_count(),
+            actual_available=(
+                F("trip__train__cargo_num")
+                * F("trip__train__places_in_cargo")
+                - F("actual_sold")
+                - F("actual_held")
+            ),
+        )
+
+    def mismatched(self):
+        return self.with_actual_sold().filter(
+            ~Q(tickets_sold=F("actual_sold"))
+            | ~Q(tickets_held=F("actual_held"))
+            | ~Q(tickets_available=F("actual_available"))
+        )
+
+    def sync(self, trips=None):
+        """
+        Create missing inventory records and recount them from tickets.
+        Returns the number of records that were recounted.
+        """
+        if trips is None:
+            trips = Trip.objects.all()
+
+        TripCargo.objects.sync(trips)
+        self.bulk_create(
+            [
+                self.model(trip_id=trip_id)
+                for trip_id in trips.filter(
+                    inventory__isnull=True
+                ).values_list("id", flat=True)
+            ],
+            ignore_conflicts=True,
+        )
+
+        capacity = (
+            Train.objects
+            .filter(trips=OuterRef("trip"))
+            .annotate(capacity=F("cargo_num") * F("places_in_cargo"))
+            .values("capacity")
+        )
+        return self.filter(trip__in=trips).update(
+            tickets_sold=_sold_tickets_count(),
+            tickets_held=_held_seats_count(),
+            tickets_available=(
+                Subquery(capacity)
+                - _sold_tickets_count()
+                - _held_seats_count()
+            ),
+            updated_at=timezone.now(),
+        )
+
+
+class TripInventory(models.Model):
+    trip = models.OneToOneField(
+        Trip,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="inventory"
+    )
+    tickets_sold = models.PositiveIntegerField(default=0)
+    tickets_held = models.PositiveIntegerField(default=0)
+    tickets_available = models.IntegerField(default=0)
+    # Bumped with every ticket change: trips change when their tickets do
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = TripInventoryManager()
+
+    class Meta:
+        verbose_name_plural = "Trip Inventories"
+
+    def __str__(self) -> str:
+        return (
+            f"Trip {self.trip_id}: {self.tickets_sold} sold, "
+            f"{self.tickets_held} held, {self.tickets_available} available"
+        )
+
+
+class TripCargoManager(models.Manager):
+
+    def sync(self, trips):
+        """Create missing lock rows for every cargo of the given trips."""
+        self.bulk_create(
+            [
+                self.model(trip_id=trip_id, number=number)
+                for trip_id, cargo_num in (
+                    trips
+                    .annotate(cargos_count=Count("cargos"))
+                    .filter(cargos_count__lt=F("train__cargo_num"))
+                    .values_list("id", "train__cargo_num")
+                )
+                for number in range(1, cargo_num + 1)
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class TripCargo(models.Model):
+    """
+    Lock row of one trip cargo. Automatic seat assignment locks it with
+    SKIP LOCKED, so concurrent orders spread over different cargos
+    instead of waiting for each other.
+    """
+    trip = models.ForeignKey(
+        Trip,
+        on_delete=models.CASCADE,
+        related_name="cargos"
+    )
+    number = models.PositiveIntegerField()
+
+    objects = TripCargoManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["trip", "number"],
+                name="unique_trip_cargo_number"
+            )
+        ]
+        ordering = ["number"]
+
+    def __str__(self) -> str:
+        return f"Trip {self.trip_id}: cargo {self.number}"
@@ -1,7 +1,127 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+
+from station.utils.estimates import EstimatedCountPaginator
+
+
+class EstimatedCountPaginationMixin:
+    """
+    Page number pagination counting with EstimatedCountPaginator: exact
+    counts up to count_estimate_threshold rows (ESTIMATED_COUNT_THRESHOLD
+    by default), planner estimates above it, flagged by count_estimated.
+    """
+
+    count_estimate_threshold = None
+
+    def django_paginator_class(self, object_list, per_page):
+        return EstimatedCountPaginator(
+            object_list, per_page, threshold=self.count_estimate_threshold
+        )
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data = {
+            "count": response.data["count"],
+            "count_estimated": self.page.paginator.estimated,
+            **response.data,
+        }
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        properties = response_schema["properties"]
+        response_schema["properties"] = {
+            "count": properties["count"],
+            "count_estimated": {"type": "boolean", "example": False},
+            **properties,
+        }
+        return response_schema
+
+
+class EstimatedCountPagination(
+    EstimatedCountPaginationMixin, PageNumberPagination
+):
+    pass
 
 
 class OrderPagination(PageNumberPagination):
     page_size = 3
     page_size_query_param = "page_size"
     max_page_size = 10
+
+
+class EstimatedCountOrderPagination(
+    EstimatedCountPaginationMixin, OrderPagination
+):
+    pass
+
+
+class TripCursorPagination(CursorPagination):
+    ordering = ("departure_time", "id")
+
+
+class OrderCursorPagination(CursorPagination):
+    page_size = 3
+    page_size_query_param = "page_size"
+    max_page_size = 10
+    ordering = ("-created_at", "id")
+
+
+class CursorOrPageNumberPagination(BasePagination):
+    """
+    Page number pagination by default, keyset (cursor) pagination
+    without a total count when requested with ?pagination=cursor.
+    """
+
+    page_number_class = PageNumberPagination
+    cursor_class = CursorPagination
+    mode_query_param = "pagination"
+    cursor_mode = "cursor"
+
+    def __init__(self):
+        self.paginator = self.page_number_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode == self.cursor_mode:
+            self.paginator = self.cursor_class()
+
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    f"Set to '{self.cursor_mode}' for cursor pagination "
+                    f"without a total count."
+                ),
+                "schema": {"type": "string", "enum": [self.cursor_mode]},
+            },
+            *self.page_number_class().get_schema_operation_parameters(view),
+            *self.cursor_class().get_schema_operation_parameters(view)[:1],
+        ]
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+
+class TripListPagination(CursorOrPageNumberPagination):
+    page_number_class = EstimatedCountPagination
+    cursor_class = TripCursorPagination
+
+
+class OrderListPagination(CursorOrPageNumberPagination):
+    page_number_class = EstimatedCountOrderPagination
+    cursor_class = OrderCursorPagination
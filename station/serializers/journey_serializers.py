@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from station.serializers.trip_serializers import TripListSerializer
+
+
+class JourneyQuerySerializer(serializers.Serializer):
+    source = serializers.IntegerField(min_value=1)
+    destination = serializers.IntegerField(min_value=1)
+    departure_after = serializers.DateTimeField(required=False)
+    min_transfer = serializers.IntegerField(
+        min_value=0,
+        default=15,
+        help_text="Minimum transfer time between legs in minutes"
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=10, default=3)
+
+    def validate(self, attrs):
+        if attrs.get("source") == attrs.get("destination"):
+            raise serializers.ValidationError(
+                "Source can't be equal to Destination"
+            )
+
+        return attrs
+
+
+class JourneySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    transfers = serializers.IntegerField()
+    legs = TripListSerializer(many=True)
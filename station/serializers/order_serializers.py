@@ -1,11 +1,30 @@
 from django.db import transaction
-from rest_framework import serializers
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, ValidationError
 
-from station.models import Order, Ticket
+from station.models import Order, Ticket, Trip
 from station.serializers.ticket_serializers import (
     TicketSerializer,
     TicketListSerializer
 )
+from station.utils.json_payload import (
+    DateTimeText,
+    JSONArrayAgg,
+    JSONBuildObject,
+    JSONText
+)
+from station.utils.seat_assignment import CargosLocked, assign_seats
+
+
+class SeatsContended(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "The free seats of the trip are being booked right now, "
+        "try again shortly."
+    )
+    default_code = "seats_contended"
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -19,10 +38,91 @@ class OrderSerializer(serializers.ModelSerializer):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+            self.fields["tickets"].create(
+                [
+                    dict(ticket_data, order=order)
+                    for ticket_data in tickets_data
+                ]
+            )
             return order
 
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+
+
+def order_list_payloads(orders, **fields):
+    """
+    Render orders like OrderListSerializer in Postgres: one JSON object
+    per order with its tickets and trips aggregated in a subquery, with
+    no related model instances loaded. Extra fields (lookups or
+    expressions) follow the id.
+    """
+    tickets = (
+        Ticket.objects
+        .filter(order=OuterRef("pk"))
+        .order_by()
+        .values(payload=JSONArrayAgg(
+            JSONBuildObject(
+                id="id",
+                cargo="cargo",
+                seat="seat",
+                trip=JSONBuildObject(
+                    route=Concat(
+                        "trip__route__source__name",
+                        Value(" - "),
+                        "trip__route__destination__name"
+                    ),
+                    departure_time=DateTimeText("trip__departure_time"),
+                    arrival_time=DateTimeText("trip__arrival_time"),
+                    train_name="trip__train__name",
+                ),
+            ),
+            ordering=("cargo", "seat"),
+        ))
+    )
+
+    return orders.annotate(
+        payload=JSONText(JSONBuildObject(
+            id="id",
+            **fields,
+            tickets=Subquery(tickets),
+            created_at=DateTimeText("created_at"),
+        ))
+    ).values_list("payload", flat=True)
+
+
+class OrderAutoSerializer(serializers.Serializer):
+    trip = serializers.PrimaryKeyRelatedField(
+        queryset=Trip.objects.select_related("train")
+    )
+    seats = serializers.IntegerField(min_value=1, max_value=10)
+
+    def create(self, validated_data):
+        trip = validated_data["trip"]
+        user = validated_data["user"]
+
+        with transaction.atomic():
+            try:
+                seats = assign_seats(trip, validated_data["seats"], user)
+            except CargosLocked:
+                raise SeatsContended()
+            if len(seats) < validated_data["seats"]:
+                raise ValidationError(
+                    {
+                        "seats": f"Only {len(seats)} free seats "
+                        f"are available on trip {trip.id}"
+                    }
+                )
+
+            serializer = OrderSerializer(
+                data={
+                    "tickets": [
+                        {"trip": trip.id, "cargo": cargo, "seat": seat}
+                        for cargo, seat in seats
+                    ]
+                },
+                context=self.context
+            )
+            serializer.is_valid(raise_exception=True)
+            return serializer.save(user=user)
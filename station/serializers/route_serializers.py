@@ -2,6 +2,7 @@ from rest_framework import serializers
 
 from station.models import Route
 from station.serializers.station_serializers import StationSerializer
+from station.serializers.values_serializers import ValuesSerializer
 
 
 class RouteSerializer(serializers.ModelSerializer):
@@ -32,6 +33,17 @@ class RouteListSerializer(RouteSerializer):
     )
 
 
+class RouteListValuesSerializer(ValuesSerializer):
+    """RouteListSerializer output from .values() rows."""
+
+    fields = {
+        "id": "id",
+        "source": "source__name",
+        "destination": "destination__name",
+        "distance": "distance",
+    }
+
+
 class RouteDetailSerializer(RouteSerializer):
     source = StationSerializer(read_only=True)
     destination = StationSerializer(read_only=True)
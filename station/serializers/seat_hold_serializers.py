@@ -0,0 +1,54 @@
+from collections import Counter
+
+from django.db.models import Q
+from django.utils import timezone
+
+from station.models import SeatHold, TripInventory, seats_filter
+from station.serializers.ticket_serializers import (
+    TicketBulkSerializer,
+    TicketSerializer
+)
+
+
+class SeatHoldBulkSerializer(TicketBulkSerializer):
+
+    def create(self, validated_data):
+        holds = self.bulk_create_seats(
+            [SeatHold(**attrs) for attrs in validated_data]
+        )
+        TripInventory.objects.record_holds(
+            Counter(hold.trip_id for hold in holds)
+        )
+        return holds
+
+    def get_replaced_holds(self, requested):
+        """
+        Holds of the current user on the seats and every expired hold of
+        their trips, released here before expire_seat_holds gets to them.
+        """
+        return SeatHold.objects.filter(
+            (seats_filter(requested) & Q(user=self.get_user()))
+            | Q(
+                trip__in={trip_id for trip_id, *_ in requested},
+                expires_at__lte=timezone.now()
+            )
+        )
+
+    def taken_seats_error(self, taken_seats):
+        return {"non_field_errors": self.taken_seats_messages(taken_seats)}
+
+
+class SeatHoldSerializer(TicketSerializer):
+
+    class Meta:
+        model = SeatHold
+        fields = (
+            "id",
+            "cargo",
+            "seat",
+            "trip",
+            "expires_at",
+        )
+        read_only_fields = ("expires_at",)
+        validators = []
+        list_serializer_class = SeatHoldBulkSerializer
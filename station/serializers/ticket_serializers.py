@@ -1,12 +1,141 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from rest_framework.validators import UniqueTogetherValidator
 
-from station.models import Ticket
+from station.models import SeatHold, Ticket, Trip, TripInventory, seats_filter
 from station.serializers.trip_serializers import TripOrderSerializer
 
 
+class TicketTripField(serializers.PrimaryKeyRelatedField):
+    """Resolve trips from the batch loaded by TicketBulkSerializer."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.trips = {}
+
+    def to_internal_value(self, data):
+        try:
+            return self.trips[int(data)]
+        except (KeyError, TypeError, ValueError):
+            return super().to_internal_value(data)
+
+
+class TicketBulkSerializer(serializers.ListSerializer):
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            trip_ids = {
+                str(ticket.get("trip"))
+                for ticket in data
+                if isinstance(ticket, dict)
+            }
+            self.child.fields["trip"].trips = (
+                Trip.objects
+                .select_related("train")
+                .in_bulk([pk for pk in trip_ids if pk.isdigit()])
+            )
+
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        taken_seats = self.get_taken_seats(
+            [
+                (ticket["trip"].id, ticket["cargo"], ticket["seat"])
+                for ticket in attrs
+            ]
+        )
+        if taken_seats:
+            raise ValidationError(self.taken_seats_messages(taken_seats))
+
+        return attrs
+
+    def create(self, validated_data):
+        tickets = self.bulk_create_seats(
+            [Ticket(**attrs) for attrs in validated_data]
+        )
+        TripInventory.objects.record_sales(
+            Counter(ticket.trip_id for ticket in tickets)
+        )
+        return tickets
+
+    def bulk_create_seats(self, seats):
+        """
+        Release the holds replaced by the seats and insert them
+        in a savepoint, reporting concurrently taken seats as errors.
+        """
+        requested = [(seat.trip_id, seat.cargo, seat.seat) for seat in seats]
+
+        try:
+            with transaction.atomic():
+                self.get_replaced_holds(requested).release()
+                seats = self.child.Meta.model.objects.bulk_create(seats)
+        except IntegrityError:
+            taken_seats = self.get_taken_seats(requested)
+            if not taken_seats:
+                raise
+            raise ValidationError(self.taken_seats_error(taken_seats))
+
+        return seats
+
+    def get_user(self):
+        request = self.context.get("request")
+        user = getattr(request, "user", None)
+        return user if user and user.is_authenticated else None
+
+    def get_replaced_holds(self, requested):
+        """Holds of the current user on the booked seats."""
+        if not (user := self.get_user()):
+            return SeatHold.objects.none()
+
+        return SeatHold.objects.filter(seats_filter(requested), user=user)
+
+    def get_taken_seats(self, requested):
+        """
+        Return (trip_id, cargo, seat) tuples that are already sold,
+        held by another user or requested more than once,
+        using a single query.
+        """
+        if not requested:
+            return []
+
+        seats = seats_filter(requested)
+        held_seats = SeatHold.objects.active().filter(seats)
+        if user := self.get_user():
+            held_seats = held_seats.exclude(user=user)
+
+        taken_seats = set(
+            Ticket.objects
+            .filter(seats)
+            .order_by()
+            .values_list("trip_id", "cargo", "seat")
+            .union(
+                held_seats.order_by().values_list("trip_id", "cargo", "seat")
+            )
+        )
+        taken_seats.update(
+            seat for seat, count in Counter(requested).items() if count > 1
+        )
+        return sorted(taken_seats)
+
+    def taken_seats_error(self, taken_seats):
+        return {
+            "tickets": {
+                "non_field_errors": self.taken_seats_messages(taken_seats)
+            }
+        }
+
+    @staticmethod
+    def taken_seats_messages(taken_seats):
+        return [
+            f"Seat {seat} in cargo {cargo} of trip {trip_id} is already taken"
+            for trip_id, cargo, seat in taken_seats
+        ]
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    trip = TicketTripField(queryset=Trip.objects.select_related("train"))
 
     class Meta:
         model = Ticket
@@ -16,12 +145,8 @@ class TicketSerializer(serializers.ModelSerializer):
             "seat",
             "trip",
         )
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Ticket.objects.all(),
-                fields=("trip", "cargo", "seat",)
-            )
-        ]
+        validators = []
+        list_serializer_class = TicketBulkSerializer
 
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
@@ -1,9 +1,15 @@
+from django.db.models import F, Value
+from django.db.models.functions import Concat
 from rest_framework import serializers
 
 from station.models import Trip, Ticket
 from station.serializers.crew_serializers import CrewDetailSerializer
 from station.serializers.route_serializers import RouteDetailSerializer
 from station.serializers.train_serializers import TrainDetailSerializer
+from station.serializers.values_serializers import (
+    ValuesSerializer,
+    datetime_converter
+)
 
 
 class TripSerializer(serializers.ModelSerializer):
@@ -49,6 +55,30 @@ class TripListSerializer(TripSerializer):
         )
 
 
+class TripListValuesSerializer(ValuesSerializer):
+    """TripListSerializer output from .values() rows."""
+
+    fields = {
+        "id": "id",
+        "route": Concat(
+            "route__source__name",
+            Value(" - "),
+            "route__destination__name"
+        ),
+        "departure_time": "departure_time",
+        "arrival_time": "arrival_time",
+        "train_name": "train__name",
+        "train_capacity": (
+            F("train__cargo_num") * F("train__places_in_cargo")
+        ),
+        "tickets_available": "tickets_available",
+    }
+    converters = {
+        "departure_time": datetime_converter,
+        "arrival_time": datetime_converter,
+    }
+
+
 class TripTicketSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -70,6 +100,33 @@ class TripDetailSerializer(TripSerializer):
         fields = TripSerializer.Meta.fields + ("taken_tickets",)
 
 
+class TripDetailWithoutTicketsSerializer(TripDetailSerializer):
+
+    class Meta(TripSerializer.Meta):
+        fields = TripSerializer.Meta.fields
+
+
+class TripSeatMapSerializer(serializers.Serializer):
+    trip = serializers.IntegerField()
+    cargo_num = serializers.IntegerField()
+    places_in_cargo = serializers.IntegerField()
+    encoding = serializers.CharField()
+    taken = serializers.ListField(
+        child=serializers.CharField(),
+        help_text=(
+            "Base64 bitmap of taken seats per cargo, most significant "
+            "bit first: bit 0 of the first byte is seat 1."
+        )
+    )
+    held = serializers.ListField(
+        child=serializers.CharField(),
+        help_text=(
+            "Seats held by other users during checkout, "
+            "encoded like taken seats."
+        )
+    )
+
+
 class TripOrderSerializer(serializers.ModelSerializer):
     route = serializers.StringRelatedField(read_only=True)
     train_name = serializers.CharField(source="train.name", read_only=True)
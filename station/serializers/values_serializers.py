@@ -0,0 +1,96 @@
+from django.utils import timezone
+from rest_framework import mixins
+from rest_framework.response import Response
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer of .values() rows for hot list endpoints, with
+    the output of a DRF serializer but none of its per-field machinery.
+
+    Subclasses declare fields in output order as lookups or expressions,
+    and converter factories for the fields DRF renders differently from
+    their database value. Fields are compiled once per class into
+    (name, key, factory) extractors, factories are called once per
+    serialization.
+    """
+
+    fields = {}
+    converters = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.lookups = []
+        cls.expressions = {}
+        cls.extractors = []
+
+        for name, lookup in cls.fields.items():
+            if isinstance(lookup, str):
+                key = lookup
+                cls.lookups.append(lookup)
+            else:
+                # Annotations can't shadow model fields
+                key = f"{name}_value"
+                cls.expressions[key] = lookup
+
+            cls.extractors.append((name, key, cls.converters.get(name)))
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values(*cls.lookups, **cls.expressions)
+
+    def __iter__(self):
+        """Serialized rows, one at a time, for streaming responses."""
+        extractors = [
+            (name, key, factory and factory())
+            for name, key, factory in self.extractors
+        ]
+        return (
+            {
+                name: row[key] if convert is None else convert(row[key])
+                for name, key, convert in extractors
+            }
+            for row in self.rows
+        )
+
+    @property
+    def data(self):
+        return list(self)
+
+
+def datetime_converter():
+    """
+    Render aware datetimes like DateTimeField (ISO 8601) in the time zone
+    current when rows are serialized.
+    """
+    tzinfo = timezone.get_current_timezone()
+
+    def convert(value):
+        text = value.astimezone(tzinfo).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return convert
+
+
+class ValuesListModelMixin(mixins.ListModelMixin):
+    """
+    List action serialized by values_serializer_class from .values()
+    rows. get_serializer_class() still describes the output schema.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.values_serializer_class
+        queryset = serializer_class.values(
+            self.filter_queryset(self.get_queryset())
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer_class(page).data)
+
+        return Response(serializer_class(queryset).data)
@@ -0,0 +1,106 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from station.cache import invalidate_model_cache
+from station.models import (
+    Crew,
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Trip,
+    Ticket,
+    TripInventory
+)
+from station.utils.journey_planner import schedule_timetable_update
+
+
+@receiver(post_save, sender=Trip)
+def sync_trip_inventory(sender, instance, **kwargs):
+    TripInventory.objects.sync(Trip.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Train)
+def sync_train_trips_inventory(sender, instance, created, **kwargs):
+    if not created:
+        TripInventory.objects.sync(instance.trips.all())
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_trip(sender, instance, **kwargs):
+    instance._previous_trip_id = (
+        Ticket.objects
+        .filter(pk=instance.pk)
+        .values_list("trip_id", flat=True)
+        .first()
+    ) if instance.pk else None
+
+
+@receiver(post_save, sender=Ticket)
+def record_ticket_sale(sender, instance, created, **kwargs):
+    previous_trip_id = getattr(instance, "_previous_trip_id", None)
+
+    if created or previous_trip_id is None:
+        TripInventory.objects.record_sales({instance.trip_id: 1})
+    elif previous_trip_id != instance.trip_id:
+        TripInventory.objects.record_sales(
+            {previous_trip_id: -1, instance.trip_id: 1}
+        )
+    else:
+        # Seat or cargo moved, the seat map of the trip changed
+        TripInventory.objects.touch([instance.trip_id])
+
+
+@receiver(post_delete, sender=Ticket)
+def record_ticket_refund(sender, instance, **kwargs):
+    TripInventory.objects.record_sales({instance.trip_id: -1})
+
+
+@receiver(post_save, sender=Crew)
+@receiver(post_delete, sender=Crew)
+@receiver(post_save, sender=TrainType)
+@receiver(post_delete, sender=TrainType)
+@receiver(post_save, sender=Train)
+@receiver(post_delete, sender=Train)
+@receiver(post_save, sender=Station)
+@receiver(post_delete, sender=Station)
+def invalidate_reference_data_cache(sender, **kwargs):
+    invalidate_model_cache(sender)
+
+
+@receiver(post_delete, sender=Route)
+def invalidate_route_lists(sender, **kwargs):
+    # Deletes leave MAX(updated_at) alone, list ETags count them instead
+    invalidate_model_cache(sender)
+
+
+@receiver(m2m_changed, sender=Trip.crew.through)
+def touch_crew_trips(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove"):
+        trip_ids = pk_set if reverse else [instance.pk]
+    elif action == "pre_clear":
+        trip_ids = instance.trips.values("pk") if reverse else [instance.pk]
+    else:
+        return
+
+    Trip.objects.filter(pk__in=trip_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Trip)
+@receiver(post_delete, sender=Trip)
+def update_trip_timetable(sender, instance, **kwargs):
+    schedule_timetable_update([instance.pk])
+
+
+@receiver(post_save, sender=Route)
+def update_route_timetable(sender, instance, created, **kwargs):
+    if not created:
+        schedule_timetable_update(
+            list(instance.trips.values_list("id", flat=True))
+        )
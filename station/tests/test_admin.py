@@ -0,0 +1,128 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from station.models import Trip
+from station.utils.estimates import EstimatedCountPaginator
+from station.utils.samples import (
+    sample_superuser,
+    sample_order,
+    sample_ticket,
+    sample_trip,
+    sample_route,
+    sample_station
+)
+
+ORDER_CHANGELIST_URL = reverse("admin:station_order_changelist")
+TRIP_CHANGELIST_URL = reverse("admin:station_trip_changelist")
+
+
+def order_change_url(order_id):
+    return reverse("admin:station_order_change", args=[order_id])
+
+
+class OrderAdminTest(TestCase):
+
+    def setUp(self) -> None:
+        self.admin = sample_superuser()
+        self.client.force_login(self.admin)
+
+    def change_page_queries(self, tickets):
+        order = sample_order(user=self.admin)
+        for seat in range(1, tickets + 1):
+            sample_ticket(trip=sample_trip(), order=order, seat=seat)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(order_change_url(order.id))
+
+        self.assertEqual(res.status_code, 200)
+        return len(queries)
+
+    def test_ticket_inline_queries(self):
+        few = self.change_page_queries(tickets=1)
+        many = self.change_page_queries(tickets=5)
+
+        # Only the label of every selected trip, in one query
+        self.assertLessEqual(many - few, 4)
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=1)
+    def test_changelist_with_estimated_count(self):
+        for _ in range(3):
+            sample_order(user=self.admin)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ORDER_CHANGELIST_URL)
+        counts = [
+            query["sql"] for query in queries if "COUNT(" in query["sql"]
+        ]
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.context["cl"].paginator.estimated)
+        self.assertEqual(len(counts), 1)
+        self.assertIn("LIMIT 2", counts[0])
+
+
+class TripAdminTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client.force_login(sample_superuser())
+
+    def test_search_by_station_name(self):
+        trip = sample_trip(
+            route=sample_route(
+                source=sample_station(name="Zürich HB"),
+                destination=sample_station(name="Bern")
+            )
+        )
+        sample_trip()
+
+        res = self.client.get(TRIP_CHANGELIST_URL, {"q": "zurich"})
+
+        self.assertEqual(
+            list(res.context["cl"].result_list), [trip]
+        )
+
+
+class EstimatedCountPaginatorTest(TestCase):
+
+    def setUp(self) -> None:
+        for _ in range(3):
+            sample_trip()
+
+    def test_exact_count_below_threshold(self):
+        paginator = EstimatedCountPaginator(Trip.objects.order_by("id"), 2)
+        paginator.threshold = 3
+
+        self.assertEqual(paginator.count, 3)
+        self.assertFalse(paginator.estimated)
+
+    def test_estimated_count_above_threshold(self):
+        paginator = EstimatedCountPaginator(
+            Trip.objects.filter(route__distance__gt=0).order_by("id"), 2
+        )
+        paginator.threshold = 1
+
+        with self.assertNumQueries(2):
+            count = paginator.count
+
+        self.assertTrue(paginator.estimated)
+        self.assertGreater(count, 1)
+        self.assertEqual(
+            list(paginator.page(paginator.num_pages + 1).object_list), []
+        )
+
+    def test_page_not_cut_at_low_estimate(self):
+        paginator = EstimatedCountPaginator(
+            Trip.objects.filter(route__distance__gt=0).order_by("id"), 3
+        )
+        paginator.threshold = 1
+
+        with patch("station.utils.estimates.estimate_count", return_value=0):
+            page = paginator.page(1)
+
+        self.assertTrue(paginator.estimated)
+        self.assertEqual(paginator.count, 2)
+        self.assertEqual(len(page.object_list), 3)
@@ -0,0 +1,126 @@
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from station.utils.samples import (
+    sample_user,
+    sample_order,
+    sample_route,
+    sample_station,
+    sample_ticket,
+    sample_trip
+)
+
+TRIP_URL = reverse("station:trip-list")
+ASYNC_TRIP_URL = reverse("station:async-trip-list")
+ROUTE_URL = reverse("station:route-list")
+ASYNC_ROUTE_URL = reverse("station:async-route-list")
+STATION_URL = reverse("station:station-list")
+ASYNC_STATION_URL = reverse("station:async-station-list")
+
+
+def detail_url(trip_id):
+    return reverse("station:trip-detail", args=[trip_id])
+
+
+def async_detail_url(trip_id):
+    return reverse("station:async-trip-detail", args=[trip_id])
+
+
+class UnauthenticatedAsyncViewsTest(TestCase):
+
+    async def test_auth_required(self):
+        res = await self.async_client.get(ASYNC_TRIP_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res.headers["WWW-Authenticate"], 'Bearer realm="api"')
+
+    async def test_invalid_token(self):
+        res = await self.async_client.get(
+            ASYNC_TRIP_URL, headers={"Authorization": "Bearer invalid"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AsyncViewsTest(TestCase):
+
+    def setUp(self) -> None:
+        user = sample_user()
+        self.headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(user)}"
+        }
+
+        self.trip = sample_trip()
+        sample_ticket(trip=self.trip, order=sample_order(user=user))
+        sample_trip(
+            route=sample_route(
+                source=sample_station(name="Kyiv"),
+                destination=sample_station(name="Lviv")
+            )
+        )
+
+    async def get_both(self, url, async_url, params=None):
+        res = await sync_to_async(self.client.get)(
+            url, params, headers=self.headers
+        )
+        async_res = await self.async_client.get(
+            async_url, params, headers=self.headers
+        )
+
+        self.assertEqual(async_res.status_code, res.status_code)
+        return res.json(), async_res.json()
+
+    async def assert_same_results(self, url, async_url, params=None):
+        data, async_data = await self.get_both(url, async_url, params)
+
+        self.assertEqual(async_data["count"], data["count"])
+        self.assertEqual(async_data["results"], data["results"])
+
+    async def test_trip_list(self):
+        await self.assert_same_results(TRIP_URL, ASYNC_TRIP_URL)
+        await self.assert_same_results(
+            TRIP_URL, ASYNC_TRIP_URL, {"from": "kyiv"}
+        )
+
+    async def test_trip_detail(self):
+        data, async_data = await self.get_both(
+            detail_url(self.trip.id), async_detail_url(self.trip.id)
+        )
+
+        self.assertEqual(async_data, data)
+        self.assertEqual(len(async_data["taken_tickets"]), 1)
+
+    async def test_trip_detail_not_found(self):
+        data, async_data = await self.get_both(
+            detail_url(0), async_detail_url(0)
+        )
+
+        self.assertEqual(async_data, data)
+
+    async def test_route_and_station_lists(self):
+        await self.assert_same_results(
+            ROUTE_URL, ASYNC_ROUTE_URL, {"source": "KYIV"}
+        )
+        await self.assert_same_results(STATION_URL, ASYNC_STATION_URL)
+
+    async def test_invalid_page(self):
+        data, async_data = await self.get_both(
+            ROUTE_URL, ASYNC_ROUTE_URL, {"page": 5}
+        )
+
+        self.assertEqual(async_data, data)
+
+    async def test_queries_are_recorded(self):
+        with self.assertLogs("station.queries", level="INFO") as logs:
+            res = await self.async_client.get(
+                ASYNC_TRIP_URL, headers=self.headers
+            )
+
+        self.assertIn('"view": "TripListAsyncView"', logs.output[0])
+        self.assertIn('"action": "list"', logs.output[0])
+        self.assertRegex(
+            res.headers["Server-Timing"], r'desc="[1-9]\d* queries"'
+        )
@@ -0,0 +1,86 @@
+import importlib
+from collections import namedtuple
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.utils.samples import sample_user, sample_superuser
+
+DB_POOL_URL = reverse("station:db-pool")
+
+Column = namedtuple("Column", "name")
+SHOW_POOLS_COLUMNS = (
+    "database",
+    "user",
+    "cl_active",
+    "cl_waiting",
+    "sv_active",
+    "sv_idle",
+    "maxwait",
+    "maxwait_us",
+)
+
+
+class DatabasePoolApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_staff_required(self):
+        self.client.force_authenticate(sample_user())
+
+        res = self.client.get(DB_POOL_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_connection_stats(self):
+        self.client.force_authenticate(sample_superuser())
+
+        res = self.client.get(DB_POOL_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertGreaterEqual(res.data["busy"], 1)
+        self.assertGreaterEqual(res.data["connections"], res.data["busy"])
+        self.assertEqual(
+            res.data["saturation"],
+            round(res.data["busy"] / res.data["pool_size"], 2)
+        )
+
+
+    @override_settings(DATABASE_POOLER="pgbouncer", DATABASE_POOL_SIZE=20)
+    def test_pgbouncer_pool_stats(self):
+        self.client.force_authenticate(sample_superuser())
+        database = connection.settings_dict["NAME"]
+        with mock.patch("station.utils.db_pool.psycopg2.connect") as connect:
+            cursor = connect().cursor().__enter__()
+            cursor.description = [
+                Column(name) for name in SHOW_POOLS_COLUMNS
+            ]
+            cursor.__iter__.return_value = [
+                (database, "app", 40, 12, 20, 0, 1, 500000),
+                ("pgbouncer", "pgbouncer", 1, 0, 0, 0, 0, 0),
+            ]
+
+            res = self.client.get(DB_POOL_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(connect.call_args.kwargs["dbname"], "pgbouncer")
+        self.assertEqual(res.data["clients_waiting"], 12)
+        self.assertEqual(res.data["servers_active"], 20)
+        self.assertEqual(res.data["max_wait"], 1.5)
+        self.assertEqual(res.data["saturation"], 1)
+
+
+class ProductionSettingsTest(SimpleTestCase):
+
+    def test_production_settings(self):
+        production = importlib.import_module("config.production")
+
+        self.assertFalse(production.DEBUG)
+        self.assertNotIn("debug_toolbar", production.INSTALLED_APPS)
+        self.assertTrue(production.DATABASES["default"]["CONN_HEALTH_CHECKS"])
+        self.assertGreater(production.DATABASES["default"]["CONN_MAX_AGE"], 0)
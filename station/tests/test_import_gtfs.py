@@ -0,0 +1,173 @@
+import tempfile
+import zipfile
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from station.models import Station, Route, Train, Trip
+
+FEED = {
+    "stops.txt": (
+        "stop_id,stop_name,stop_lat,stop_lon,location_type\n"
+        "KYIV,Kyiv,50.4403,30.4891,\n"
+        "ZHYT,Zhytomyr,50.2647,28.6766,0\n"
+        "LVIV,Lviv,49.8397,23.9944,\n"
+        "KYIV_E,Kyiv entrance,50.4401,30.4890,2\n"
+    ),
+    "routes.txt": (
+        "route_id,route_short_name,route_long_name,route_type\n"
+        "IC,743,Kyiv - Lviv,2\n"
+    ),
+    "trips.txt": (
+        "route_id,service_id,trip_id\n"
+        "IC,DAILY,743\n"
+        "IC,DAILY,745\n"
+        "IC,DAILY,NO_TIMES\n"
+        "IC,WEEKEND,747\n"
+    ),
+    "calendar.txt": (
+        "service_id,monday,tuesday,wednesday,thursday,friday,saturday,"
+        "sunday,start_date,end_date\n"
+        "DAILY,1,1,1,1,1,1,1,20240101,20241231\n"
+        "WEEKEND,0,0,0,0,0,1,1,20240101,20241231\n"
+    ),
+    "stop_times.txt": (
+        "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+        "743,06:00:00,06:00:00,KYIV,1\n"
+        "743,07:40:00,07:42:00,ZHYT,2\n"
+        "743,11:10:00,11:10:00,LVIV,3\n"
+        "745,23:50:00,23:50:00,ZHYT,1\n"
+        "745,25:05:00,25:05:00,LVIV,2\n"
+        "747,09:00:00,09:00:00,KYIV,1\n"
+        "747,14:00:00,14:00:00,LVIV,2\n"
+    ),
+}
+
+
+class ImportGtfsTest(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = Path(self.directory.name)
+        self.write_feed(FEED)
+
+    def write_feed(self, feed):
+        for name, content in feed.items():
+            (self.path / name).write_text(content)
+
+    def import_feed(self, path=None):
+        out = StringIO()
+        call_command(
+            "import_gtfs",
+            str(path or self.path),
+            "--service-date=2024-05-01",
+            "--timezone=Europe/Kyiv",
+            "--batch-size=2",
+            stdout=out
+        )
+        return out.getvalue()
+
+    def test_import_feed(self):
+        out = self.import_feed()
+
+        self.assertIn("stop_times.txt: 7 rows", out)
+        self.assertIn("rows/s", out)
+        self.assertEqual(
+            set(Station.objects.values_list("gtfs_id", flat=True)),
+            {"KYIV", "ZHYT", "LVIV"}
+        )
+        train = Train.objects.get(gtfs_id="IC")
+        self.assertEqual(train.name, "743")
+        self.assertEqual(train.train_type.name, "Rail")
+
+        kyiv_time = ZoneInfo("Europe/Kyiv")
+        trip = Trip.objects.get(gtfs_id="743:2024-05-01")
+        self.assertEqual(trip.route.source.name, "Kyiv")
+        self.assertEqual(trip.route.destination.name, "Lviv")
+        self.assertEqual(trip.route.distance, 467)
+        self.assertEqual(
+            trip.departure_time, datetime(2024, 5, 1, 6, tzinfo=kyiv_time)
+        )
+        self.assertEqual(
+            Trip.objects.get(gtfs_id="745:2024-05-01").arrival_time,
+            datetime(2024, 5, 2, 1, 5, tzinfo=kyiv_time)
+        )
+        self.assertEqual(
+            trip.inventory.tickets_available, train.capacity
+        )
+        self.assertFalse(Trip.objects.filter(gtfs_id__startswith="NO_TIMES"))
+        # Weekend service, 2024-05-01 is a Wednesday
+        self.assertFalse(Trip.objects.filter(gtfs_id__startswith="747"))
+
+    def test_calendar_dates_exceptions(self):
+        self.write_feed({
+            "calendar_dates.txt": (
+                "service_id,date,exception_type\n"
+                "DAILY,20240501,2\n"
+                "WEEKEND,20240501,1\n"
+                "DAILY,20240502,1\n"
+            )
+        })
+
+        self.import_feed()
+
+        self.assertEqual(
+            list(Trip.objects.values_list("gtfs_id", flat=True)),
+            ["747:2024-05-01"]
+        )
+
+    def test_reimport_upserts_by_gtfs_ids(self):
+        self.import_feed()
+        self.write_feed({
+            "stops.txt": FEED["stops.txt"].replace("Kyiv,", "Kyiv-Pas,"),
+            "stop_times.txt": FEED["stop_times.txt"].replace(
+                "743,06:00:00,06:00:00", "743,06:15:00,06:15:00"
+            ),
+        })
+
+        self.import_feed()
+
+        self.assertEqual(Station.objects.count(), 3)
+        self.assertEqual(Route.objects.count(), 2)
+        self.assertEqual(Trip.objects.count(), 2)
+        self.assertTrue(Station.objects.filter(name="Kyiv-Pas").exists())
+        self.assertEqual(
+            Trip.objects.get(gtfs_id="743:2024-05-01").departure_time.minute,
+            15
+        )
+
+    def test_import_zipped_feed(self):
+        archive = self.path / "feed.zip"
+        with zipfile.ZipFile(archive, "w") as feed:
+            for name, content in FEED.items():
+                feed.writestr(name, content)
+
+        self.import_feed(archive)
+
+        self.assertEqual(Trip.objects.count(), 2)
+
+    def test_missing_file(self):
+        (self.path / "trips.txt").unlink()
+
+        with self.assertRaises(CommandError):
+            self.import_feed()
+
+    def test_missing_calendar(self):
+        (self.path / "calendar.txt").unlink()
+
+        with self.assertRaisesMessage(CommandError, "calendar"):
+            self.import_feed()
+
+    def test_missing_column_not_reported_as_missing_file(self):
+        self.write_feed({
+            "routes.txt": "route_id,route_short_name\nIC,743\n"
+        })
+
+        with self.assertRaisesMessage(KeyError, "route_type"):
+            self.import_feed()
@@ -0,0 +1,129 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.cache import bump_model_generation
+from station.models import Trip
+from station.utils.journey_planner import timetable
+from station.utils.samples import (
+    sample_user,
+    sample_trip,
+    sample_route,
+    sample_station,
+    sample_train,
+    sample_ticket,
+    sample_order
+)
+
+JOURNEY_URL = reverse("station:journey-list")
+
+
+class UnauthenticatedJourneyApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        res = self.client.get(JOURNEY_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedJourneyApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(self.user)
+
+        self.kyiv = sample_station(name="Kyiv")
+        self.lviv = sample_station(name="Lviv")
+        self.odesa = sample_station(name="Odesa")
+        self.train = sample_train()
+        self.start = timezone.now() + datetime.timedelta(days=1)
+
+        self.first_leg = self.sample_leg(self.kyiv, self.lviv, 0, 5)
+        self.second_leg = self.sample_leg(self.lviv, self.odesa, 6, 10)
+        # Test trips are never committed, so nothing bumps the generation
+        bump_model_generation(Trip)
+
+    def sample_leg(self, source, destination, departure, arrival):
+        return sample_trip(
+            route=sample_route(source=source, destination=destination),
+            train=self.train,
+            departure_time=self.start + datetime.timedelta(hours=departure),
+            arrival_time=self.start + datetime.timedelta(hours=arrival),
+        )
+
+    def plan(self, **params):
+        params.setdefault("source", self.kyiv.id)
+        params.setdefault("destination", self.odesa.id)
+        res = self.client.get(JOURNEY_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_plan_journey_with_transfer(self):
+        sample_ticket(
+            trip=self.second_leg, order=sample_order(user=self.user)
+        )
+
+        journeys = self.plan()
+
+        self.assertEqual(len(journeys), 1)
+        self.assertEqual(journeys[0]["transfers"], 1)
+        self.assertEqual(
+            [
+                (leg["id"], leg["tickets_available"])
+                for leg in journeys[0]["legs"]
+            ],
+            [
+                (self.first_leg.id, self.train.capacity),
+                (self.second_leg.id, self.train.capacity - 1),
+            ]
+        )
+
+    def test_transfer_shorter_than_minimum_is_skipped(self):
+        journeys = self.plan(min_transfer=90)
+
+        self.assertEqual(journeys, [])
+
+    def test_new_trip_applied_to_timetable_without_reload(self):
+        self.plan()
+        with self.captureOnCommitCallbacks(execute=True):
+            direct = self.sample_leg(self.kyiv, self.odesa, 1, 4)
+
+        with self.assertNumQueries(1):
+            journeys = self.plan()
+
+        self.assertEqual(
+            [
+                [leg["id"] for leg in journey["legs"]]
+                for journey in journeys
+            ],
+            [[direct.id]]
+        )
+
+    def test_change_by_other_worker_reloads_timetable(self):
+        self.plan()
+        # A trip changed by another worker in the meantime
+        bump_model_generation(Trip)
+        with self.captureOnCommitCallbacks(execute=True):
+            direct = self.sample_leg(self.kyiv, self.odesa, 1, 4)
+
+        self.assertIsNone(timetable.generation)
+        self.assertEqual(
+            [journey["legs"][0]["id"] for journey in self.plan()],
+            [direct.id]
+        )
+
+    def test_plan_with_same_source_and_destination(self):
+        res = self.client.get(
+            JOURNEY_URL,
+            {"source": self.kyiv.id, "destination": self.kyiv.id}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
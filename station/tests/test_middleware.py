@@ -0,0 +1,107 @@
+import contextvars
+import logging
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.middleware import (
+    QueryBudgetExceeded,
+    QueryMetrics,
+    install_query_recorder,
+    record_query,
+    request_metrics
+)
+from station.utils.samples import sample_superuser, sample_user, sample_trip
+from station.views import TripViewSet
+
+TRIP_URL = reverse("station:trip-list")
+TRIP_EXPORT_URL = reverse("station:trip-export")
+
+
+class QueryBudgetMiddlewareTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(sample_user())
+        sample_trip()
+
+    def test_server_timing_header(self):
+        res = self.client.get(TRIP_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertRegex(
+            res.headers["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="\d+ queries", total;dur=[\d.]+$'
+        )
+
+    def test_query_log(self):
+        with self.assertLogs("station.queries", level="INFO") as logs:
+            self.client.get(TRIP_URL)
+
+        self.assertIn('"view": "TripViewSet"', logs.output[0])
+        self.assertIn('"action": "list"', logs.output[0])
+
+    def test_query_log_not_built_below_info(self):
+        logger = logging.getLogger("station.queries")
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.WARNING)
+
+        with mock.patch.object(logger, "info") as info:
+            self.client.get(TRIP_URL)
+
+        info.assert_not_called()
+
+    def test_streamed_queries_logged_after_stream(self):
+        self.client.force_authenticate(sample_superuser())
+
+        with self.assertLogs("station.queries", level="INFO") as logs:
+            res = self.client.get(TRIP_EXPORT_URL)
+            self.assertEqual(logs.output, [])
+            b"".join(res.streaming_content)
+            res.close()
+
+        self.assertIn('"action": "export"', logs.output[0])
+        self.assertIn('"queries": 1,', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_budget_violation_raises_in_strict_mode(self):
+        with mock.patch.object(TripViewSet, "query_budget", {"list": 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(TRIP_URL)
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_budget_violation_logged_otherwise(self):
+        with mock.patch.object(TripViewSet, "query_budget", {"list": 0}):
+            with self.assertLogs("station.queries", level="WARNING") as logs:
+                res = self.client.get(TRIP_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("TripViewSet.list ran", logs.output[0])
+
+    def test_interleaved_requests_count_own_queries(self):
+        install_query_recorder(connection)
+        contexts = [contextvars.copy_context() for _ in range(2)]
+        metrics = [QueryMetrics(), QueryMetrics()]
+        for context, request_metric in zip(contexts, metrics):
+            context.run(request_metrics.set, request_metric)
+
+        def query():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        for context in (contexts[0], contexts[1], contexts[0]):
+            context.run(query)
+
+        self.assertEqual(
+            [request_metric.count for request_metric in metrics], [2, 1]
+        )
+
+    def test_query_recorder_installed_once(self):
+        install_query_recorder(connection)
+        install_query_recorder(connection)
+
+        self.assertEqual(connection.execute_wrappers.count(record_query), 1)
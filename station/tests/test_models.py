@@ -1,5 +1,11 @@
+import datetime
+
 from django.core.exceptions import ValidationError
+from django.core.management import call_command, CommandError
 from django.test import TestCase
+from django.utils import timezone
+
+from station.models import Trip, TripInventory, TripSchedule
 
 from station.utils.samples import (
     sample_crew,
@@ -8,6 +14,7 @@ from station.utils.samples import (
     sample_station,
     sample_route,
     sample_trip,
+    sample_trip_schedule,
     sample_order,
     sample_ticket,
     sample_user
@@ -128,3 +135,135 @@ class TicketModelTest(TestCase):
                 order=order,
                 trip=self.trip
             )
+
+
+class TripInventoryModelTest(TestCase):
+
+    def setUp(self) -> None:
+        self.trip = sample_trip()
+
+    def assert_inventory(self, sold):
+        inventory = TripInventory.objects.get(trip=self.trip)
+        self.assertEqual(inventory.tickets_sold, sold)
+        self.assertEqual(
+            inventory.tickets_available,
+            self.trip.train.capacity - sold
+        )
+
+    def test_inventory_created_with_trip(self):
+        self.assert_inventory(sold=0)
+
+    def test_ticket_create_and_delete_update_inventory(self):
+        ticket = sample_ticket(trip=self.trip)
+        sample_ticket(trip=self.trip, order=ticket.order, seat=2)
+        self.assert_inventory(sold=2)
+
+        ticket.delete()
+        self.assert_inventory(sold=1)
+
+    def test_train_change_updates_inventory(self):
+        sample_ticket(trip=self.trip)
+        self.trip.train.cargo_num = 1
+        self.trip.train.save()
+
+        self.assert_inventory(sold=1)
+
+    def test_sync_command_rebuilds_counters(self):
+        sample_ticket(trip=self.trip)
+        TripInventory.objects.filter(trip=self.trip).update(
+            tickets_sold=0, tickets_available=0
+        )
+
+        with self.assertRaises(CommandError):
+            call_command("sync_trip_inventory", "--check")
+
+        call_command("sync_trip_inventory")
+
+        self.assert_inventory(sold=1)
+
+
+class TripScheduleModelTest(TestCase):
+
+    def setUp(self) -> None:
+        self.monday = datetime.date(2024, 4, 1)
+        self.schedule = sample_trip_schedule(valid_from=self.monday)
+        self.schedule.crew.add(sample_crew(), sample_crew(first_name="x"))
+
+    def test_departures(self):
+        departures = self.schedule.departures(
+            self.monday, self.monday + datetime.timedelta(days=6)
+        )
+
+        self.assertEqual(
+            [departure.date().isoweekday() for departure, _ in departures],
+            [1, 3, 5]
+        )
+        departure, arrival = departures[0]
+        self.assertEqual(
+            timezone.localtime(departure),
+            timezone.make_aware(datetime.datetime(2024, 4, 1, 22, 30))
+        )
+        self.assertEqual(
+            timezone.localtime(arrival),
+            timezone.make_aware(datetime.datetime(2024, 4, 2, 7, 15))
+        )
+
+    def test_departures_within_validity(self):
+        self.schedule.valid_until = self.monday + datetime.timedelta(days=3)
+
+        self.assertEqual(
+            len(self.schedule.departures(
+                self.monday - datetime.timedelta(days=7),
+                self.monday + datetime.timedelta(days=14)
+            )),
+            2
+        )
+
+    def test_expand_is_idempotent(self):
+        until = self.monday + datetime.timedelta(days=13)
+
+        created = TripSchedule.objects.expand(until, since=self.monday)
+        trip_ids = set(self.schedule.trips.values_list("id", flat=True))
+        self.assertEqual(len(created), 6)
+
+        repeated = TripSchedule.objects.expand(until, since=self.monday)
+        self.assertEqual(repeated, [])
+        self.assertEqual(
+            set(self.schedule.trips.values_list("id", flat=True)), trip_ids
+        )
+
+        extended = TripSchedule.objects.expand(
+            until + datetime.timedelta(days=7), since=self.monday
+        )
+        self.assertEqual(len(extended), 3)
+        self.assertEqual(self.schedule.trips.count(), 9)
+        self.assertTrue(
+            trip_ids < set(self.schedule.trips.values_list("id", flat=True))
+        )
+
+        trip = self.schedule.trips.first()
+        self.assertEqual(trip.crew.count(), 2)
+        self.assertEqual(
+            trip.inventory.tickets_available, self.schedule.train.capacity
+        )
+
+    def test_overnight_trip_needs_arrival_days(self):
+        self.schedule.arrival_days = 0
+
+        with self.assertRaises(ValidationError):
+            self.schedule.full_clean()
+
+    def test_expand_command(self):
+        sample_trip_schedule(
+            route=self.schedule.route,
+            train=self.schedule.train,
+            weekdays=list(range(1, 8)),
+            valid_from=timezone.localdate()
+        )
+
+        call_command("expand_trip_schedules", "--days", "6")
+        call_command("expand_trip_schedules", "--days", "6")
+
+        self.assertEqual(
+            Trip.objects.filter(schedule__weekdays__len=7).count(), 7
+        )
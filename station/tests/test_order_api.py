@@ -1,17 +1,30 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import threading
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from station.models import Order
+from station.models import Order, Ticket, TripCargo, TripInventory
 from station.serializers.order_serializers import OrderListSerializer
 from station.utils.samples import (
+    sample_superuser,
     sample_user,
     sample_order,
+    sample_ticket,
+    sample_seat_hold,
+    sample_train,
     sample_trip
 )
 
 ORDER_URL = reverse("station:order-list")
+AUTO_ORDER_URL = reverse("station:order-auto")
+EXPORT_ORDER_URL = reverse("station:order-export")
 
 
 class UnauthenticatedOrderApiTest(TestCase):
@@ -43,6 +56,41 @@ class AuthenticatedOrderApiTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data.get("results"), serializer.data)
 
+    def test_list_order_with_tickets_renders_like_serializer(self):
+        order = sample_order(user=self.user)
+        trip = sample_trip()
+        sample_ticket(trip=trip, order=order, seat=2)
+        sample_ticket(trip=trip, order=order, seat=1)
+        sample_order(user=self.user)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(ORDER_URL)
+
+        orders = Order.objects.filter(user=self.user).prefetch_related(
+            "tickets__trip__route__source",
+            "tickets__trip__route__destination",
+            "tickets__trip__train"
+        )
+        serializer = OrderListSerializer(orders, many=True)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["results"], serializer.data)
+
+    def test_list_order_with_cursor_pagination(self):
+        orders = [sample_order(user=self.user) for _ in range(5)]
+
+        res = self.client.get(ORDER_URL, {"pagination": "cursor"})
+        order_ids = [order["id"] for order in res.data.get("results")]
+        res = self.client.get(res.data.get("next"))
+        order_ids += [order["id"] for order in res.data.get("results")]
+
+        self.assertNotIn("count", res.data)
+        self.assertIsNone(res.data.get("next"))
+        self.assertEqual(
+            order_ids,
+            [order.id for order in reversed(orders)]
+        )
+
     def test_create_order_with_tickets(self):
         data = {
             "tickets": [
@@ -67,3 +115,263 @@ class AuthenticatedOrderApiTest(TestCase):
             res.data.get("tickets").get("non_field_errors")[0],
             "This list may not be empty."
         )
+
+    def test_create_order_with_many_tickets(self):
+        trip = sample_trip()
+        data = {
+            "tickets": [
+                {"cargo": cargo, "seat": seat, "trip": trip.id}
+                for cargo in (1, 2)
+                for seat in (1, 2, 3)
+            ]
+        }
+        res = self.client.post(ORDER_URL, data=data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.filter(trip=trip).count(), 6)
+        self.assertEqual(
+            TripInventory.objects.get(trip=trip).tickets_sold, 6
+        )
+
+    def test_create_order_with_seat_out_of_train_range(self):
+        trip = sample_trip()
+        data = {
+            "tickets": [
+                {"cargo": 1, "seat": 1, "trip": trip.id},
+                {"cargo": 1, "seat": 1000, "trip": trip.id},
+            ]
+        }
+        res = self.client.post(ORDER_URL, data=data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat", res.data.get("tickets")[1])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_create_order_with_duplicated_seats(self):
+        trip = sample_trip()
+        data = {
+            "tickets": [
+                {"cargo": 1, "seat": 1, "trip": trip.id},
+                {"cargo": 1, "seat": 1, "trip": trip.id},
+            ]
+        }
+        res = self.client.post(ORDER_URL, data=data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data.get("tickets").get("non_field_errors"),
+            [f"Seat 1 in cargo 1 of trip {trip.id} is already taken"]
+        )
+        self.assertFalse(Order.objects.exists())
+
+    def test_create_order_with_taken_seats(self):
+        trip = sample_trip()
+        sample_ticket(
+            trip=trip, cargo=2, seat=5, order=sample_order(user=self.user)
+        )
+        data = {
+            "tickets": [
+                {"cargo": 1, "seat": 1, "trip": trip.id},
+                {"cargo": 2, "seat": 5, "trip": trip.id},
+            ]
+        }
+        res = self.client.post(ORDER_URL, data=data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data.get("tickets").get("non_field_errors"),
+            [f"Seat 5 in cargo 2 of trip {trip.id} is already taken"]
+        )
+
+    def test_create_order_queries_do_not_grow_with_tickets(self):
+        trip = sample_trip()
+        queries = []
+
+        for cargo, seats in ((1, 1), (2, 10)):
+            data = {
+                "tickets": [
+                    {"cargo": cargo, "seat": seat, "trip": trip.id}
+                    for seat in range(1, seats + 1)
+                ]
+            }
+            with CaptureQueriesContext(connection) as context:
+                res = self.client.post(ORDER_URL, data=data, format="json")
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            queries.append(len(context.captured_queries))
+
+        self.assertEqual(queries[0], queries[1])
+
+
+class OrderExportApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(sample_superuser())
+
+        self.users = [sample_user(), sample_user(email="other@user.com")]
+        trip = sample_trip()
+        for seat, user in enumerate(self.users, start=1):
+            sample_ticket(
+                trip=trip, order=sample_order(user=user), seat=seat
+            )
+
+    def test_export_forbidden_for_non_staff(self):
+        self.client.force_authenticate(self.users[0])
+        res = self.client.get(EXPORT_ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_orders_of_all_users(self):
+        res = self.client.get(EXPORT_ORDER_URL)
+        rows = [
+            json.loads(line)
+            for line in b"".join(res.streaming_content).splitlines()
+        ]
+        orders = Order.objects.order_by("id")
+
+        self.assertEqual(
+            [row["user"] for row in rows], [user.id for user in self.users]
+        )
+        self.assertEqual(
+            [{key: row[key] for key in ("id", "tickets", "created_at")}
+             for row in rows],
+            json.loads(json.dumps(
+                OrderListSerializer(orders, many=True).data
+            ))
+        )
+
+    def test_export_orders_csv(self):
+        res = self.client.get(EXPORT_ORDER_URL, {"export_format": "csv"})
+        rows = list(csv.DictReader(
+            io.StringIO(b"".join(res.streaming_content).decode())
+        ))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(json.loads(rows[1]["tickets"])[0]["seat"], 2)
+
+
+class AutoOrderApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(self.user)
+
+        self.trip = sample_trip(
+            train=sample_train(cargo_num=3, places_in_cargo=4)
+        )
+        self.order = sample_order(user=self.user)
+
+    def take_seats(self, seats):
+        for cargo, seat in seats:
+            sample_ticket(
+                trip=self.trip, order=self.order, cargo=cargo, seat=seat
+            )
+
+    def order_seats(self, count):
+        return self.client.post(
+            AUTO_ORDER_URL,
+            data={"trip": self.trip.id, "seats": count},
+            format="json"
+        )
+
+    def test_auto_order_picks_seats_together(self):
+        self.take_seats([(1, 4), (2, 2)])
+
+        res = self.order_seats(3)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(ticket["cargo"], ticket["seat"]) for ticket in res.data["tickets"]],
+            [(1, 1), (1, 2), (1, 3)]
+        )
+        self.assertEqual(
+            TripInventory.objects.get(trip=self.trip).tickets_sold, 5
+        )
+
+    def test_auto_order_skips_seats_held_by_others(self):
+        self.take_seats([(1, 4), (2, 4), (3, 4)])
+        sample_seat_hold(
+            trip=self.trip, user=sample_user(email="other@user.com")
+        )
+
+        res = self.order_seats(3)
+
+        self.assertEqual(
+            [(ticket["cargo"], ticket["seat"]) for ticket in res.data["tickets"]],
+            [(2, 1), (2, 2), (2, 3)]
+        )
+
+    def test_auto_order_spreads_seats_over_cargos(self):
+        self.take_seats([(1, 1), (1, 3), (2, 1), (2, 3), (3, 1), (3, 3)])
+
+        res = self.order_seats(5)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["tickets"]), 5)
+        self.assertEqual(Ticket.objects.filter(trip=self.trip).count(), 11)
+
+    def test_auto_order_without_enough_free_seats(self):
+        self.take_seats((cargo, 1) for cargo in range(1, 4))
+        self.take_seats((cargo, 2) for cargo in range(1, 4))
+
+        res = self.order_seats(7)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Order.objects.count(), 1)
+
+
+class AutoOrderLockingTest(TransactionTestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(sample_user())
+
+        self.trip = sample_trip(
+            train=sample_train(cargo_num=2, places_in_cargo=4)
+        )
+
+    def order_with_locked_cargos(self, numbers):
+        locked = threading.Event()
+        release = threading.Event()
+
+        def lock_cargos():
+            with transaction.atomic():
+                list(
+                    TripCargo.objects
+                    .filter(trip=self.trip, number__in=numbers)
+                    .select_for_update()
+                )
+                locked.set()
+                release.wait(timeout=10)
+            connection.close()
+
+        worker = threading.Thread(target=lock_cargos)
+        worker.start()
+        locked.wait(timeout=10)
+
+        try:
+            return self.client.post(
+                AUTO_ORDER_URL,
+                data={"trip": self.trip.id, "seats": 2},
+                format="json"
+            )
+        finally:
+            release.set()
+            worker.join()
+
+    def test_auto_order_skips_locked_cargos(self):
+        res = self.order_with_locked_cargos([1])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            {ticket["cargo"] for ticket in res.data["tickets"]}, {2}
+        )
+
+    def test_auto_order_with_all_cargos_locked(self):
+        res = self.order_with_locked_cargos([1, 2])
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["detail"].code, "seats_contended")
+        self.assertFalse(Order.objects.exists())
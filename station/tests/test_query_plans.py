@@ -0,0 +1,272 @@
+import json
+import os
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from station.utils.samples import (
+    sample_user,
+    sample_crew,
+    sample_timetable,
+    sample_order_history
+)
+from station.views import (
+    CrewViewSet,
+    TrainTypeViewSet,
+    TrainViewSet,
+    StationViewSet,
+    RouteViewSet,
+    TripViewSet,
+    OrderViewSet
+)
+
+BASELINE_PATH = Path(__file__).with_name("query_plan_baseline.json")
+UPDATE_BASELINE = os.environ.get("UPDATE_QUERY_PLAN_BASELINE") == "1"
+COST_TOLERANCE = 1.25
+# Per query: tables cost a few pages more after other tests rolled back
+COST_SLACK = 10
+BIG_TABLES = {
+    "station_route",
+    "station_trip",
+    "station_tripinventory",
+    "station_order",
+    "station_ticket",
+}
+AGGREGATE_NODES = {"Aggregate", "Unique", "HashAggregate", "GroupAggregate"}
+MAX_UNLIMITED_SORT_ROWS = 1000
+
+
+def get_viewset(viewset_class, action, user, params=None, **kwargs):
+    view = viewset_class(
+        action=action,
+        action_map={"get": action},
+        kwargs=kwargs,
+        format_kwarg=None
+    )
+    view.request = view.initialize_request(
+        APIRequestFactory().get("/", params)
+    )
+    view.request.user = user
+    return view
+
+
+def get_viewset_queryset(viewset_class, action, user, params=None):
+    return get_viewset(viewset_class, action, user, params).get_queryset()
+
+
+def capture_action_queries(viewset_class, action, user, params, kwargs):
+    """
+    Return the response and the SQL of the queries of a list or retrieve
+    request run through the full view dispatch: freshness validators,
+    counts and the page or the object. EXPLAIN count estimates are left
+    out, they plan their query but never run it.
+    """
+    request = APIRequestFactory().get("/", params)
+    force_authenticate(request, user)
+    # Cached responses would hide the queries
+    cache.clear()
+
+    with CaptureQueriesContext(connection) as context:
+        response = viewset_class.as_view({"get": action})(request, **kwargs)
+
+    return response, [
+        query["sql"]
+        for query in context.captured_queries
+        if not query["sql"].startswith("EXPLAIN")
+    ]
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+
+    return plan if isinstance(plan, list) else json.loads(plan)
+
+
+def get_plan_nodes(plan, ancestors=()):
+    yield plan, ancestors
+    for child in plan.get("Plans", []):
+        yield from get_plan_nodes(child, ancestors + (plan["Node Type"],))
+
+
+def is_bounded_count(sql):
+    """Exact counts of paginators, reading threshold + 1 rows at most."""
+    return sql.startswith("SELECT COUNT(*) FROM (") and " LIMIT " in sql
+
+
+def get_forbidden_nodes(plan, bounded=False):
+    for node, ancestors in get_plan_nodes(plan):
+        node_type = node["Node Type"]
+        if (
+            node_type == "Seq Scan"
+            and node["Relation Name"] in BIG_TABLES
+            and not bounded
+        ):
+            yield f"Seq Scan on {node['Relation Name']}"
+        if (
+            node_type in ("Sort", "Incremental Sort")
+            and "Limit" not in ancestors
+            and node["Plan Rows"] > MAX_UNLIMITED_SORT_ROWS
+        ):
+            yield f"unbounded {node_type} by {node['Sort Key']}"
+        # Plain aggregates (MAX, bounded COUNT) compute a single row
+        if node_type in AGGREGATE_NODES and node.get("Strategy") != "Plain":
+            yield f"{node_type} (distinct or group by)"
+
+
+class QueryPlanTest(TestCase):
+    """
+    Explain the queries of every viewset list/retrieve request on a
+    large generated dataset, including the freshness and count queries. Fails on sequential scans of big tables,
+    unbounded sorts, distinct/group by aggregation and on estimated cost
+    regressions against query_plan_baseline.json. Regenerate the baseline
+    with UPDATE_QUERY_PLAN_BASELINE=1.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = sample_user()
+        cls.crew = sample_crew()
+        cls.trips = sample_timetable()
+        cls.history_user = sample_order_history(cls.trips)[0]
+
+    def get_index_names(self, params):
+        queryset = get_viewset_queryset(
+            TripViewSet, "list", self.user, params
+        )
+        plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+        return {
+            node["Index Name"]
+            for node, _ in get_plan_nodes(plan)
+            if "Index Name" in node
+        }
+
+    def get_day(self, trip_time):
+        return timezone.localtime(trip_time).date().isoformat()
+
+    def test_departure_date_filter_uses_departure_index(self):
+        self.assertIn(
+            "trip_departure_time_id_idx",
+            self.get_index_names(
+                {"departure_date": self.get_day(self.trips[10].departure_time)}
+            )
+        )
+
+    def test_station_and_departure_date_filter_uses_route_index(self):
+        self.assertIn(
+            "trip_route_departure_time_idx",
+            self.get_index_names(
+                {
+                    "from": "Station 42",
+                    "departure_date": self.get_day(
+                        self.trips[10].departure_time
+                    ),
+                }
+            )
+        )
+
+    def test_arrival_date_filter_uses_arrival_index(self):
+        self.assertIn(
+            "trip_arrival_time_idx",
+            self.get_index_names(
+                {"arrival_date": self.get_day(self.trips[10].arrival_time)}
+            )
+        )
+
+    def get_cases(self):
+        trip = self.trips[10]
+        departure_day = timezone.localtime(trip.departure_time).date()
+        arrival_day = timezone.localtime(trip.arrival_time).date()
+
+        return [
+            ("crew-list", CrewViewSet, "list", {}, {}),
+            ("train-type-list", TrainTypeViewSet, "list", {}, {}),
+            ("train-list", TrainViewSet, "list", {}, {}),
+            ("train-detail", TrainViewSet, "retrieve", {}, {
+                "pk": trip.train_id
+            }),
+            ("station-list", StationViewSet, "list", {}, {}),
+            ("station-list-name", StationViewSet, "list", {
+                "name": "Station 42"
+            }, {}),
+            ("station-detail", StationViewSet, "retrieve", {}, {
+                "pk": trip.route.source_id
+            }),
+            ("route-list", RouteViewSet, "list", {}, {}),
+            ("route-list-source-destination", RouteViewSet, "list", {
+                "source": "Station 42", "destination": "Station 43"
+            }, {}),
+            ("route-detail", RouteViewSet, "retrieve", {}, {
+                "pk": trip.route_id
+            }),
+            ("trip-list", TripViewSet, "list", {}, {}),
+            ("trip-list-cursor", TripViewSet, "list", {
+                "pagination": "cursor"
+            }, {}),
+            ("trip-list-from-to", TripViewSet, "list", {
+                "from": "Station 42", "to": "Station 43"
+            }, {}),
+            ("trip-list-departure-date", TripViewSet, "list", {
+                "departure_date": departure_day.isoformat()
+            }, {}),
+            ("trip-list-arrival-date", TripViewSet, "list", {
+                "arrival_date": arrival_day.isoformat()
+            }, {}),
+            ("trip-detail", TripViewSet, "retrieve", {}, {"pk": trip.id}),
+            ("order-list", OrderViewSet, "list", {}, {}),
+            ("order-list-cursor", OrderViewSet, "list", {
+                "pagination": "cursor"
+            }, {}),
+        ]
+
+    def test_viewset_query_plans(self):
+        baseline = (
+            json.loads(BASELINE_PATH.read_text())
+            if BASELINE_PATH.exists() else {}
+        )
+        costs = {}
+
+        for name, viewset_class, action, params, kwargs in self.get_cases():
+            user = self.history_user if name.startswith("order") else (
+                self.user
+            )
+            response, queries = capture_action_queries(
+                viewset_class, action, user, params, kwargs
+            )
+            plans = [(explain(sql)[0]["Plan"], sql) for sql in queries]
+            costs[name] = round(
+                sum(plan["Total Cost"] for plan, _ in plans), 2
+            )
+
+            with self.subTest(name):
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    [
+                        node
+                        for plan, sql in plans
+                        for node in get_forbidden_nodes(
+                            plan, bounded=is_bounded_count(sql)
+                        )
+                    ],
+                    []
+                )
+
+                if not UPDATE_BASELINE:
+                    self.assertIn(name, baseline, "No baseline cost recorded")
+                    self.assertLessEqual(
+                        costs[name],
+                        max(
+                            baseline[name] * COST_TOLERANCE,
+                            baseline[name] + COST_SLACK * len(plans)
+                        )
+                    )
+
+        if UPDATE_BASELINE:
+            BASELINE_PATH.write_text(json.dumps(costs, indent=4) + "\n")
@@ -1,12 +1,14 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
 from station.models import Route
 from station.serializers.route_serializers import (
     RouteDetailSerializer,
-    RouteListSerializer
+    RouteListSerializer,
+    RouteListValuesSerializer
 )
 from station.utils.samples import (
     sample_user,
@@ -51,6 +53,32 @@ class AuthenticatedRouteApiTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data.get("results"), serializer.data)
 
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=1)
+    def test_list_route_with_estimated_count(self):
+        sample_route()
+        sample_route()
+
+        res = self.client.get(ROUTE_URL)
+
+        self.assertTrue(res.data.get("count_estimated"))
+        self.assertEqual(
+            len(res.data.get("results")), Route.objects.count()
+        )
+
+    def test_list_values_serializer_renders_like_list_serializer(self):
+        sample_route(source=sample_station(name="Kyiv"))
+        routes = Route.objects.all()
+
+        values = RouteListValuesSerializer(
+            RouteListValuesSerializer.values(routes)
+        )
+        serializer = RouteListSerializer(routes, many=True)
+
+        self.assertEqual(
+            JSONRenderer().render(values.data),
+            JSONRenderer().render(serializer.data)
+        )
+
     def test_retrieve_route(self):
         res = self.client.get(detail_url(self.route.id))
 
@@ -99,6 +127,16 @@ class AuthenticatedRouteApiTest(TestCase):
             res.data.get("results")
         )
 
+    def test_filter_routes_ignores_case_and_accents(self):
+        new_route = sample_route(source=sample_station(name="Kraków Główny"))
+
+        res = self.client.get(ROUTE_URL, {"source": "krakow glow"})
+
+        self.assertEqual(
+            [route["id"] for route in res.data.get("results")],
+            [new_route.id]
+        )
+
 
 class AdminRouteApiTest(TestCase):
 
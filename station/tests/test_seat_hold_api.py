@@ -0,0 +1,194 @@
+import datetime
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import SeatHold, Ticket, Trip, TripInventory
+from station.utils.seat_map import decode_seat_map
+from station.utils.samples import (
+    sample_user,
+    sample_seat_hold,
+    sample_trip
+)
+
+HOLD_URL = reverse("station:seat-hold-list")
+ORDER_URL = reverse("station:order-list")
+
+
+def detail_url(hold_id):
+    return reverse("station:seat-hold-detail", args=[hold_id])
+
+
+class UnauthenticatedSeatHoldApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        res = self.client.get(HOLD_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedSeatHoldApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(self.user)
+
+        self.other_user = sample_user(email="other@user.com")
+        self.trip = sample_trip()
+
+    def assert_inventory(self, sold, held):
+        inventory = TripInventory.objects.get(trip=self.trip)
+        self.assertEqual(inventory.tickets_sold, sold)
+        self.assertEqual(inventory.tickets_held, held)
+        self.assertEqual(
+            inventory.tickets_available,
+            self.trip.train.capacity - sold - held
+        )
+
+    def test_create_seat_holds(self):
+        data = [
+            {"cargo": 1, "seat": 1, "trip": self.trip.id},
+            {"cargo": 1, "seat": 2, "trip": self.trip.id},
+        ]
+        res = self.client.post(HOLD_URL, data=data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(self.user.seat_holds.count(), 2)
+        self.assert_inventory(sold=0, held=2)
+
+    def test_create_single_seat_hold(self):
+        data = {"cargo": 1, "seat": 1, "trip": self.trip.id}
+        res = self.client.post(HOLD_URL, data=data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assert_inventory(sold=0, held=1)
+
+    def test_list_active_seat_holds(self):
+        hold = sample_seat_hold(trip=self.trip, user=self.user)
+        sample_seat_hold(
+            trip=self.trip,
+            user=self.user,
+            seat=2,
+            expires_at=timezone.now() - datetime.timedelta(minutes=1)
+        )
+        sample_seat_hold(trip=self.trip, user=self.other_user, seat=3)
+
+        res = self.client.get(HOLD_URL)
+
+        self.assertEqual(
+            [hold["id"] for hold in res.data["results"]], [hold.id]
+        )
+
+    def test_seat_held_by_another_user_is_taken(self):
+        sample_seat_hold(trip=self.trip, user=self.other_user)
+        data = [{"cargo": 1, "seat": 1, "trip": self.trip.id}]
+
+        res = self.client.post(HOLD_URL, data=data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["non_field_errors"],
+            [f"Seat 1 in cargo 1 of trip {self.trip.id} is already taken"]
+        )
+
+        res = self.client.post(
+            ORDER_URL, data={"tickets": data}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_order_releases_own_seat_holds(self):
+        sample_seat_hold(trip=self.trip, user=self.user)
+        data = {"tickets": [{"cargo": 1, "seat": 1, "trip": self.trip.id}]}
+
+        res = self.client.post(ORDER_URL, data=data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.exists())
+        self.assert_inventory(sold=1, held=0)
+
+    def test_expired_seat_hold_is_replaced(self):
+        sample_seat_hold(
+            trip=self.trip,
+            user=self.other_user,
+            expires_at=timezone.now() - datetime.timedelta(minutes=1)
+        )
+        data = [{"cargo": 1, "seat": 1, "trip": self.trip.id}]
+
+        res = self.client.post(HOLD_URL, data=data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.get().user, self.user)
+        self.assert_inventory(sold=0, held=1)
+
+    def test_expired_seat_holds_of_trip_released_on_hold(self):
+        sample_seat_hold(
+            trip=self.trip,
+            user=self.other_user,
+            seat=5,
+            expires_at=timezone.now() - datetime.timedelta(minutes=1)
+        )
+        data = [{"cargo": 1, "seat": 1, "trip": self.trip.id}]
+
+        self.client.post(HOLD_URL, data=data, format="json")
+
+        self.assertEqual(SeatHold.objects.get().seat, 1)
+        self.assert_inventory(sold=0, held=1)
+
+    def test_expired_seat_holds_count_as_available(self):
+        sample_seat_hold(trip=self.trip, user=self.user, seat=1)
+        sample_seat_hold(
+            trip=self.trip,
+            user=self.user,
+            seat=2,
+            expires_at=timezone.now() - datetime.timedelta(minutes=1)
+        )
+
+        trip = Trip.objects.with_tickets_available().get(pk=self.trip.pk)
+
+        self.assertEqual(trip.tickets_available, self.trip.train.capacity - 1)
+
+    def test_delete_seat_hold(self):
+        hold = sample_seat_hold(trip=self.trip, user=self.user)
+
+        res = self.client.delete(detail_url(hold.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+        self.assert_inventory(sold=0, held=0)
+
+    def test_seat_map_shows_seats_held_by_others(self):
+        sample_seat_hold(trip=self.trip, user=self.user, seat=1)
+        sample_seat_hold(trip=self.trip, user=self.other_user, seat=2)
+
+        res = self.client.get(
+            reverse("station:trip-seats", args=[self.trip.id])
+        )
+
+        self.assertEqual(
+            decode_seat_map(res.data["places_in_cargo"], res.data["held"]),
+            {(1, 2)}
+        )
+
+    def test_expire_command_releases_expired_holds(self):
+        expired = timezone.now() - datetime.timedelta(minutes=1)
+        for seat in range(1, 6):
+            sample_seat_hold(
+                trip=self.trip, user=self.user, seat=seat, expires_at=expired
+            )
+        sample_seat_hold(trip=self.trip, user=self.user, seat=6)
+
+        call_command("expire_seat_holds", "--batch-size", "2")
+
+        self.assertEqual(SeatHold.objects.count(), 1)
+        self.assert_inventory(sold=0, held=1)
+        call_command("sync_trip_inventory", "--check")
@@ -55,6 +55,60 @@ class AuthenticatedTrainApiTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_search_stations_by_name(self):
+        zurich = sample_station(name="Zürich Hauptbahnhof")
+        sample_station(name="Zug")
+
+        res = self.client.get(STATION_URL, {"name": "zurich"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [station["id"] for station in res.data.get("results")],
+            [zurich.id]
+        )
+
+    def test_search_stations_ranked_and_typo_tolerant(self):
+        similar = sample_station(name="Zürich Hauptbahnhof")
+        exact = sample_station(name="Hauptbahnhof")
+
+        res = self.client.get(STATION_URL, {"name": "Hauptbanhof"})
+
+        self.assertEqual(
+            [station["id"] for station in res.data.get("results")],
+            [exact.id, similar.id]
+        )
+
+    def test_list_station_served_from_cache(self):
+        self.client.get(STATION_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(STATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data.get("results")), 1)
+
+    def test_not_modified_served_from_cache(self):
+        etag = self.client.get(STATION_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(STATION_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_station_changes_invalidate_cache(self):
+        self.client.get(STATION_URL)
+
+        admin_client = APIClient()
+        admin_client.force_authenticate(sample_superuser())
+        admin_client.post(
+            STATION_URL,
+            {"name": "new_station", "latitude": 1.0, "longitude": 2.0}
+        )
+        res = self.client.get(STATION_URL)
+
+        self.assertEqual(len(res.data.get("results")), 2)
+
     def test_create_train_forbidden(self):
         data = {
             "name": "test_station",
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+
+from station.throttling import SlidingWindowAnonRateThrottle
+
+
+class MinuteThrottle(SlidingWindowAnonRateThrottle):
+    rate = "4/min"
+
+
+class SlidingWindowThrottleTest(SimpleTestCase):
+
+    def setUp(self) -> None:
+        caches["throttle"].clear()
+        self.request = APIRequestFactory().get("/")
+        self.request.user = AnonymousUser()
+        self.now = 6000.0
+
+    def allow(self):
+        throttle = MinuteThrottle()
+        with mock.patch.object(throttle, "timer", return_value=self.now):
+            allowed = throttle.allow_request(self.request, None)
+        return allowed, throttle
+
+    def test_throttles_over_rate(self):
+        for _ in range(4):
+            self.assertTrue(self.allow()[0])
+
+        allowed, throttle = self.allow()
+
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 75)
+
+    def test_rejected_requests_are_not_counted(self):
+        for _ in range(6):
+            self.allow()
+
+        self.assertEqual(caches["throttle"].get(self.allow()[1].window_key), 4)
+
+    def test_previous_window_weighted_by_overlap(self):
+        for _ in range(4):
+            self.allow()
+
+        self.now += 60
+        allowed, throttle = self.allow()
+
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 15)
+
+        self.now += 15
+        self.assertTrue(self.allow()[0])
+        self.assertFalse(self.allow()[0])
+
+        self.now += 15
+        self.assertTrue(self.allow()[0])
+
+    def test_counts_per_window_in_shared_cache(self):
+        self.allow()
+        self.now += 60
+        self.allow()
+        key = MinuteThrottle().get_cache_key(self.request, None)
+
+        self.assertEqual(
+            caches["throttle"].get_many([f"{key}:100", f"{key}:101"]),
+            {f"{key}:100": 1, f"{key}:101": 1}
+        )
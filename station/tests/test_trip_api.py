@@ -1,19 +1,30 @@
+import csv
 import datetime
+import io
+import json
 from operator import itemgetter
+from unittest import mock
 
 from django.db.models import F, Count
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
 from station.models import Trip
 from station.serializers.trip_serializers import (
     TripDetailSerializer,
-    TripListSerializer
+    TripListSerializer,
+    TripListValuesSerializer
 )
+from station.utils.seat_map import decode_seat_map
+from station.views import TripViewSet
 from station.utils.samples import (
     sample_user,
+    sample_order,
+    sample_ticket,
     sample_superuser,
     sample_trip,
     sample_route,
@@ -29,6 +40,13 @@ def detail_url(trip_id):
     return reverse("station:trip-detail", args=[trip_id])
 
 
+EXPORT_URL = reverse("station:trip-export")
+
+
+def seats_url(trip_id):
+    return reverse("station:trip-seats", args=[trip_id])
+
+
 class UnauthenticatedTripApiTest(TestCase):
 
     def setUp(self) -> None:
@@ -76,6 +94,27 @@ class AuthenticatedTripApiTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data.get("results"), serializer_data)
 
+    def test_list_values_serializer_renders_like_list_serializer(self):
+        sample_trip(
+            departure_time=timezone.make_aware(
+                datetime.datetime(2024, 1, 5, 3, 4, 5, 123400)
+            ),
+            arrival_time=timezone.make_aware(
+                datetime.datetime(2024, 7, 5, 3, 4, 5)
+            )
+        )
+        trips = self.trips.order_by("id")
+
+        values = TripListValuesSerializer(
+            TripListValuesSerializer.values(trips)
+        )
+        serializer = TripListSerializer(trips, many=True)
+
+        self.assertEqual(
+            JSONRenderer().render(values.data),
+            JSONRenderer().render(serializer.data)
+        )
+
     def test_retrieve_trip(self):
         res = self.client.get(detail_url(self.trip.id))
 
@@ -160,6 +199,326 @@ class AuthenticatedTripApiTest(TestCase):
         self.assertIn(new_trip_serializer.data, res.data.get("results"))
 
 
+class TripDateFilterApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(sample_user())
+
+        midnight = timezone.localtime().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) + datetime.timedelta(days=2)
+        self.after_midnight = sample_trip(
+            departure_time=midnight + datetime.timedelta(minutes=30),
+            arrival_time=midnight + datetime.timedelta(hours=23, minutes=59),
+        )
+        self.before_midnight = sample_trip(
+            route=self.after_midnight.route,
+            train=self.after_midnight.train,
+            departure_time=midnight - datetime.timedelta(minutes=30),
+            arrival_time=midnight + datetime.timedelta(days=1),
+        )
+        self.day = midnight.date().isoformat()
+
+    def test_filter_by_departure_date_in_local_time(self):
+        res = self.client.get(TRIP_URL, {"departure_date": self.day})
+
+        self.assertEqual(
+            [trip["id"] for trip in res.data.get("results")],
+            [self.after_midnight.id]
+        )
+
+    def test_filter_by_arrival_date_in_local_time(self):
+        res = self.client.get(TRIP_URL, {"arrival_date": self.day})
+
+        self.assertEqual(
+            [trip["id"] for trip in res.data.get("results")],
+            [self.after_midnight.id]
+        )
+
+
+class TripPaginationApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(sample_user())
+
+        route = sample_route()
+        train = sample_train()
+        now = timezone.now()
+        self.trips = [
+            sample_trip(
+                route=route,
+                train=train,
+                departure_time=now + datetime.timedelta(days=days),
+                arrival_time=now + datetime.timedelta(days=days, hours=5),
+            )
+            for days in (3, 1, 2, 5, 4, 7, 6, 9, 8)
+        ]
+        self.trips.sort(key=lambda trip: (trip.departure_time, trip.id))
+
+    def test_page_number_pagination_by_default(self):
+        res = self.client.get(TRIP_URL)
+
+        self.assertEqual(res.data.get("count"), len(self.trips))
+
+    def test_exact_count_below_threshold(self):
+        res = self.client.get(TRIP_URL)
+
+        self.assertFalse(res.data.get("count_estimated"))
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=5)
+    def test_estimated_count_above_threshold(self):
+        res = self.client.get(TRIP_URL)
+
+        self.assertTrue(res.data.get("count_estimated"))
+        self.assertGreater(res.data.get("count"), 5)
+        self.assertEqual(len(res.data.get("results")), 7)
+
+    def test_cursor_pagination(self):
+        res = self.client.get(TRIP_URL, {"pagination": "cursor"})
+        trip_ids = [trip["id"] for trip in res.data.get("results")]
+
+        self.assertNotIn("count", res.data)
+        self.assertIsNone(res.data.get("previous"))
+
+        res = self.client.get(res.data.get("next"))
+        trip_ids += [trip["id"] for trip in res.data.get("results")]
+
+        self.assertIsNone(res.data.get("next"))
+        self.assertEqual(trip_ids, [trip.id for trip in self.trips])
+
+
+class TripSeatMapApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(self.user)
+
+        self.trip = sample_trip(
+            train=sample_train(cargo_num=3, places_in_cargo=10)
+        )
+        order = sample_order(user=self.user)
+        self.taken = {(1, 1), (1, 8), (1, 9), (3, 10)}
+        for cargo, seat in self.taken:
+            sample_ticket(trip=self.trip, order=order, cargo=cargo, seat=seat)
+
+    def test_seat_map(self):
+        res = self.client.get(seats_url(self.trip.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["cargo_num"], 3)
+        self.assertEqual(res.data["taken"][0], "gYA=")
+        self.assertEqual(res.data["taken"][1], "AAA=")
+        self.assertEqual(
+            decode_seat_map(
+                res.data["places_in_cargo"], res.data["taken"]
+            ),
+            self.taken
+        )
+
+    def test_retrieve_trip_without_taken_tickets(self):
+        res = self.client.get(
+            detail_url(self.trip.id), {"taken_tickets": "false"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("taken_tickets", res.data)
+
+        res = self.client.get(detail_url(self.trip.id))
+
+        self.assertEqual(len(res.data["taken_tickets"]), len(self.taken))
+
+
+class TripConditionalGetApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(self.user)
+        departure_time = timezone.now() + datetime.timedelta(days=1)
+        self.trip = sample_trip(
+            departure_time=departure_time,
+            arrival_time=departure_time + datetime.timedelta(hours=5)
+        )
+
+    def test_not_modified_if_none_match(self):
+        res = self.client.get(TRIP_URL)
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(
+                TRIP_URL, HTTP_IF_NONE_MATCH=res["ETag"]
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(not_modified["ETag"], res["ETag"])
+
+    def test_not_modified_if_modified_since(self):
+        res = self.client.get(detail_url(self.trip.id))
+        not_modified = self.client.get(
+            detail_url(self.trip.id),
+            HTTP_IF_MODIFIED_SINCE=res["Last-Modified"]
+        )
+
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_ticket_sale_changes_etag(self):
+        etag = self.client.get(detail_url(self.trip.id))["ETag"]
+        list_etag = self.client.get(TRIP_URL)["ETag"]
+
+        sample_ticket(trip=self.trip, order=sample_order(user=self.user))
+        res = self.client.get(
+            detail_url(self.trip.id), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["taken_tickets"]), 1)
+        self.assertNotEqual(
+            self.client.get(TRIP_URL, HTTP_IF_NONE_MATCH=list_etag)
+            .status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_empty_list_not_modified(self):
+        params = {"departure_date": "1999-01-01"}
+        res = self.client.get(TRIP_URL, params)
+        not_modified = self.client.get(
+            TRIP_URL, params, HTTP_IF_NONE_MATCH=res["ETag"]
+        )
+
+        self.assertEqual(res.data["results"], [])
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_missing_trip_not_found(self):
+        res = self.client.get(detail_url(0), HTTP_IF_NONE_MATCH='"0-0"')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_malformed_trip_id_not_found(self):
+        res = self.client.get(f"{TRIP_URL}abc/", HTTP_IF_NONE_MATCH='"0-0"')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_seat_change_changes_etag(self):
+        ticket = sample_ticket(
+            trip=self.trip, order=sample_order(user=self.user), seat=1
+        )
+        etag = self.client.get(detail_url(self.trip.id))["ETag"]
+
+        ticket.seat = 2
+        ticket.save()
+        res = self.client.get(
+            detail_url(self.trip.id), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken_tickets"][0]["seat"], 2)
+
+    def test_crew_change_changes_etag(self):
+        etag = self.client.get(detail_url(self.trip.id))["ETag"]
+
+        self.trip.crew.add(sample_crew())
+        res = self.client.get(
+            detail_url(self.trip.id), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_trip_delete_changes_list_etag(self):
+        other = sample_trip(departure_time=self.trip.departure_time)
+        etag = self.client.get(TRIP_URL)["ETag"]
+
+        other.delete()
+        res = self.client.get(TRIP_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_station_rename_changes_etag(self):
+        etag = self.client.get(TRIP_URL)["ETag"]
+
+        source = self.trip.route.source
+        source.name = "Renamed"
+        source.save()
+        res = self.client.get(TRIP_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class TripExportApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(sample_superuser())
+
+        route = sample_route(
+            source=sample_station(name="Lviv"),
+            destination=sample_station(name="Kyiv")
+        )
+        now = timezone.now()
+        for days in range(1, 5):
+            sample_trip(
+                route=route if days < 4 else sample_route(),
+                departure_time=now + datetime.timedelta(days=days),
+                arrival_time=now + datetime.timedelta(days=days, hours=5)
+            )
+
+    def test_export_forbidden_for_non_staff(self):
+        self.client.force_authenticate(sample_user())
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_ndjson_like_list(self):
+        res = self.client.get(EXPORT_URL, {"from": "Lviv"})
+        rows = [
+            json.loads(line)
+            for line in b"".join(res.streaming_content).splitlines()
+        ]
+        listed = self.client.get(TRIP_URL, {"from": "Lviv"}).data
+
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(
+            rows, json.loads(JSONRenderer().render(listed["results"]))
+        )
+
+    def test_export_csv(self):
+        res = self.client.get(EXPORT_URL, {"export_format": "csv"})
+        rows = list(csv.DictReader(
+            io.StringIO(b"".join(res.streaming_content).decode())
+        ))
+
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(
+            list(rows[0]), list(TripListValuesSerializer.fields)
+        )
+
+    def test_export_in_chunks(self):
+        with mock.patch.object(TripViewSet, "export_chunk_size", 3):
+            res = self.client.get(EXPORT_URL)
+            with self.assertNumQueries(2):
+                lines = b"".join(res.streaming_content).splitlines()
+
+        self.assertEqual(
+            [json.loads(line)["id"] for line in lines],
+            list(Trip.objects.order_by("id").values_list("id", flat=True))
+        )
+
+    def test_export_unknown_format(self):
+        res = self.client.get(EXPORT_URL, {"export_format": "xml"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class AdminTripApiTest(TestCase):
 
     def setUp(self) -> None:
@@ -0,0 +1,85 @@
+from django.core.cache import caches
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+
+class SlidingWindowRateThrottleMixin:
+    """
+    Sliding window counter in a cache shared by all workers, instead of
+    the per-process list of request timestamps of SimpleRateThrottle.
+    Keeps one counter per client and fixed window and weights the previous
+    window's count by its overlap with the sliding window, so every check
+    is a couple of cache round trips whatever the rate.
+    """
+
+    cache_alias = "throttle"
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        self.window_key = f"{self.key}:{int(window)}"
+        self.elapsed = elapsed / self.duration
+        self.previous_count = self.cache.get(
+            f"{self.key}:{int(window) - 1}", 0
+        )
+        self.current_count = self.increment(self.window_key)
+
+        if self.estimate(self.current_count) > self.num_requests:
+            self.current_count = self.cache.decr(self.window_key)
+            return self.throttle_failure()
+
+        return self.throttle_success()
+
+    def increment(self, key):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Both windows must outlive the current one.
+            if self.cache.add(key, 1, timeout=2 * self.duration):
+                return 1
+            return self.cache.incr(key)
+
+    def estimate(self, count):
+        return self.previous_count * (1 - self.elapsed) + count
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """
+        Seconds until the estimate leaves room for one more request,
+        either later in this window or in the next one.
+        """
+        free = self.num_requests - self.current_count - 1
+
+        if free >= 0:
+            fraction = 1 - self.elapsed - free / self.previous_count
+        else:
+            fraction = (
+                1 - self.elapsed
+                + 1 - (self.num_requests - 1) / self.current_count
+            )
+
+        return max(fraction, 0) * self.duration
+
+
+class SlidingWindowAnonRateThrottle(
+    SlidingWindowRateThrottleMixin, AnonRateThrottle
+):
+    pass
+
+
+class SlidingWindowUserRateThrottle(
+    SlidingWindowRateThrottleMixin, UserRateThrottle
+):
+    pass
@@ -1,6 +1,12 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from station.async_views import (
+    TripListAsyncView,
+    TripDetailAsyncView,
+    RouteListAsyncView,
+    StationListAsyncView,
+)
 from station.views import (
     CrewViewSet,
     TrainTypeViewSet,
@@ -8,7 +14,10 @@ from station.views import (
     StationViewSet,
     RouteViewSet,
     TripViewSet,
+    JourneyViewSet,
+    SeatHoldViewSet,
     OrderViewSet,
+    DatabasePoolView,
 )
 
 router = routers.DefaultRouter()
@@ -18,10 +27,33 @@ router.register("trains", TrainViewSet, basename="train")
 router.register("stations", StationViewSet, basename="station")
 router.register("routes", RouteViewSet, basename="route")
 router.register("trips", TripViewSet, basename="trip")
+router.register("journeys", JourneyViewSet, basename="journey")
+router.register("holds", SeatHoldViewSet, basename="seat-hold")
 router.register("orders", OrderViewSet, basename="order")
 
 urlpatterns = [
-    path("", include(router.urls))
+    path("", include(router.urls)),
+    path(
+        "async/trips/",
+        TripListAsyncView.as_view(),
+        name="async-trip-list"
+    ),
+    path(
+        "async/trips/<int:pk>/",
+        TripDetailAsyncView.as_view(),
+        name="async-trip-detail"
+    ),
+    path(
+        "async/routes/",
+        RouteListAsyncView.as_view(),
+        name="async-route-list"
+    ),
+    path(
+        "async/stations/",
+        StationListAsyncView.as_view(),
+        name="async-station-list"
+    ),
+    path("db-pool/", DatabasePoolView.as_view(), name="db-pool"),
 ]
 
 app_name = "station"
@@ -0,0 +1,15 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+
+def local_day_range(day):
+    """
+    Return the aware [start, end) datetimes of a "%Y-%m-%d" day in the
+    current time zone, so date filters can use plain range lookups.
+    """
+    start = datetime.combine(datetime.strptime(day, "%Y-%m-%d"), time.min)
+    return (
+        timezone.make_aware(start),
+        timezone.make_aware(start + timedelta(days=1)),
+    )
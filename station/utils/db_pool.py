@@ -0,0 +1,98 @@
+from contextlib import closing
+
+import psycopg2
+from django.conf import settings
+from django.db import connection
+
+
+def get_connection_stats():
+    """
+    Pool statistics of PgBouncer when DATABASE_POOLER is "pgbouncer",
+    otherwise of the direct connections to the database.
+    """
+    if settings.DATABASE_POOLER == "pgbouncer":
+        return get_pgbouncer_stats()
+    return get_database_stats()
+
+
+def get_pgbouncer_stats():
+    """
+    Client and server connections of the PgBouncer pools of the current
+    database from SHOW POOLS on the admin console (the virtual pgbouncer
+    database). Clients waiting for a server connection mean the pool is
+    saturated, however busy the database itself looks.
+    """
+    database = settings.DATABASES["default"]
+    with closing(
+        psycopg2.connect(
+            dbname="pgbouncer",
+            host=database["HOST"],
+            port=database["PORT"],
+            user=database["USER"],
+            password=database["PASSWORD"],
+            connect_timeout=5,
+        )
+    ) as admin:
+        # The admin console knows neither transactions nor prepared
+        # statements, psycopg2 sends plain queries
+        admin.autocommit = True
+        with admin.cursor() as cursor:
+            cursor.execute("SHOW POOLS")
+            columns = [column.name for column in cursor.description]
+            pools = [
+                pool
+                for pool in (dict(zip(columns, row)) for row in cursor)
+                if pool["database"] == database["NAME"]
+            ]
+
+    servers_active = sum(pool["sv_active"] for pool in pools)
+    return {
+        "pooler": "pgbouncer",
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "clients_active": sum(pool["cl_active"] for pool in pools),
+        "clients_waiting": sum(pool["cl_waiting"] for pool in pools),
+        "servers_active": servers_active,
+        "servers_idle": sum(pool["sv_idle"] for pool in pools),
+        "max_wait": max(
+            (
+                pool["maxwait"] + pool.get("maxwait_us", 0) / 1_000_000
+                for pool in pools
+            ),
+            default=0,
+        ),
+        "saturation": round(servers_active / settings.DATABASE_POOL_SIZE, 2),
+    }
+
+
+def get_database_stats():
+    """
+    Count server connections to the current database by state with
+    a single pg_stat_activity query and relate the busy ones to the
+    configured pool size.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                coalesce(state, 'unknown'),
+                count(*),
+                current_setting('max_connections')::int
+            FROM pg_stat_activity
+            WHERE datname = current_database()
+                AND backend_type = 'client backend'
+            GROUP BY state
+            """
+        )
+        rows = cursor.fetchall()
+
+    states = {state: count for state, count, _ in rows}
+    busy = states.get("active", 0) + states.get("idle in transaction", 0)
+
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_connections": rows[0][2] if rows else None,
+        "connections": sum(states.values()),
+        "busy": busy,
+        "states": states,
+        "saturation": round(busy / settings.DATABASE_POOL_SIZE, 2),
+    }
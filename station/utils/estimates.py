@@ -0,0 +1,89 @@
+import json
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def table_estimate(model, using="default"):
+    """Rows of the model's table in the planner statistics."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table]
+        )
+        row = cursor.fetchone()
+
+    # -1 until the table is vacuumed or analyzed for the first time
+    return int(row[0]) if row and row[0] >= 0 else None
+
+
+def estimate_count(queryset):
+    """
+    Rows the query planner expects the queryset to return: the table
+    statistics for unfiltered querysets, the EXPLAIN estimate otherwise.
+    Costs a planning of the query at most, but may be far off.
+    """
+    query = queryset.query
+    if not query.has_filters() and not query.distinct:
+        estimate = table_estimate(queryset.model, queryset.db)
+        if estimate is not None:
+            return estimate
+
+    plan = json.loads(queryset.explain(format="json"))
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator counting exactly up to threshold rows (by default
+    ESTIMATED_COUNT_THRESHOLD) and taking the planner estimate above it,
+    when estimated is set. The exact count is bounded by a LIMIT, so it
+    never reads more than threshold + 1 rows. Since the estimate may be
+    low, pages are never cut at an estimated count and pages past it are
+    empty instead of invalid.
+    """
+
+    threshold = None
+    estimated = False
+
+    def __init__(self, *args, threshold=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if threshold is not None:
+            self.threshold = threshold
+
+    def get_threshold(self):
+        if self.threshold is None:
+            return settings.ESTIMATED_COUNT_THRESHOLD
+        return self.threshold
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, "query"):
+            return super().count
+
+        threshold = self.get_threshold()
+        count = self.object_list[:threshold + 1].count()
+        if count <= threshold:
+            return count
+
+        self.estimated = True
+        return max(estimate_count(self.object_list), count)
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.estimated and int(number) > self.num_pages:
+                return int(number)
+            raise
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.estimated:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        return self._get_page(self.object_list[bottom:top], number, self)
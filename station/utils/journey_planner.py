@@ -0,0 +1,189 @@
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from station.cache import bump_model_generation, get_model_generation
+from station.models import Trip
+
+Connection = namedtuple(
+    "Connection",
+    (
+        "departure_time",
+        "trip_id",
+        "arrival_time",
+        "source_id",
+        "destination_id",
+    )
+)
+
+
+class Timetable:
+    """
+    Departure sorted array of upcoming trip connections used by
+    the connection scan journey planner. Trip changes made in this
+    process are applied incrementally; changes made by other workers
+    are detected through the trip cache generation and trigger a reload.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = None
+        self.connections = []
+        self.departures = []
+
+    @staticmethod
+    def fetch_connections(trips):
+        return [
+            Connection(*values)
+            for values in trips.values_list(
+                "departure_time",
+                "id",
+                "arrival_time",
+                "route__source_id",
+                "route__destination_id",
+            ).iterator(chunk_size=5000)
+        ]
+
+    def publish(self, connections, generation):
+        connections.sort()
+        self.connections, self.departures = connections, [
+            connection.departure_time for connection in connections
+        ]
+        self.generation = generation
+
+    def load(self):
+        with self.lock:
+            generation = get_model_generation(Trip)
+            self.publish(
+                self.fetch_connections(
+                    Trip.objects.filter(departure_time__gte=timezone.now())
+                ),
+                generation,
+            )
+
+    def ensure_loaded(self):
+        if self.generation != get_model_generation(Trip):
+            self.load()
+
+    def apply_trip_changes(self, trip_ids, generation):
+        """
+        Apply committed changes of trip_ids, which bumped the trip
+        generation to generation. A generation further ahead means
+        changes made by other workers were missed: the timetable is
+        dropped and reloaded on its next use instead.
+        """
+        with self.lock:
+            if self.generation is None:
+                return
+
+            if generation != self.generation + 1:
+                self.generation = None
+                self.connections, self.departures = [], []
+                return
+
+            connections = [
+                connection
+                for connection in self.connections
+                if connection.trip_id not in trip_ids
+            ]
+            connections += self.fetch_connections(
+                Trip.objects.filter(
+                    id__in=trip_ids,
+                    departure_time__gte=timezone.now()
+                )
+            )
+            self.publish(connections, generation)
+
+    def earliest_arrival(
+        self, source_id, destination_id, departure_after, min_transfer
+    ):
+        """
+        Connection scan for the earliest arrival at destination_id
+        leaving source_id not before departure_after.
+        Returns the list of connections (legs) or None.
+        """
+        connections, departures = self.connections, self.departures
+        earliest = {source_id: departure_after}
+        arrived_by = {}
+
+        for index in range(
+            bisect_left(departures, departure_after), len(connections)
+        ):
+            connection = connections[index]
+            target_arrival = earliest.get(destination_id)
+            if target_arrival and connection.departure_time >= target_arrival:
+                break
+
+            ready_at = earliest.get(connection.source_id)
+            if ready_at is None:
+                continue
+            if connection.source_id != source_id:
+                ready_at += min_transfer
+
+            reached = earliest.get(connection.destination_id)
+            if ready_at <= connection.departure_time and (
+                reached is None or connection.arrival_time < reached
+            ):
+                earliest[connection.destination_id] = connection.arrival_time
+                arrived_by[connection.destination_id] = connection
+
+        if destination_id not in arrived_by:
+            return None
+
+        legs = []
+        station_id = destination_id
+        while station_id != source_id:
+            connection = arrived_by[station_id]
+            legs.append(connection)
+            station_id = connection.source_id
+
+        return legs[::-1]
+
+    def plan(
+        self,
+        source_id,
+        destination_id,
+        departure_after,
+        min_transfer=timedelta(minutes=15),
+        limit=3,
+    ):
+        """
+        Return up to `limit` journeys, each a list of connections,
+        ordered by departure of their first leg.
+        """
+        self.ensure_loaded()
+        journeys = []
+
+        while len(journeys) < limit:
+            legs = self.earliest_arrival(
+                source_id, destination_id, departure_after, min_transfer
+            )
+            if not legs:
+                break
+
+            journeys.append(legs)
+            departure_after = legs[0].departure_time + timedelta(
+                microseconds=1
+            )
+
+        return journeys
+
+
+timetable = Timetable()
+
+
+def schedule_timetable_update(trip_ids):
+    """
+    After commit, bump the trip generation for other workers and apply
+    the change to the timetable of this process.
+    """
+    trip_ids = set(trip_ids)
+
+    def update_timetable():
+        timetable.apply_trip_changes(trip_ids, bump_model_generation(Trip))
+
+    transaction.on_commit(update_timetable)
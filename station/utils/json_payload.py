@@ -0,0 +1,76 @@
+from itertools import chain
+
+from django.contrib.postgres.aggregates.mixins import OrderableAggMixin
+from django.db import models
+from django.db.models import Aggregate, F, Func, Value
+from django.utils import timezone
+
+
+class JSONBuildObject(Func):
+    """
+    JSON (not JSONB) object keeping the keys in the given order, so it
+    renders like a serializer. Values are field names or expressions.
+    """
+
+    function = "JSON_BUILD_OBJECT"
+    output_field = models.JSONField()
+
+    def __init__(self, **fields):
+        super().__init__(
+            *chain.from_iterable(
+                (Value(key), F(value) if isinstance(value, str) else value)
+                for key, value in fields.items()
+            )
+        )
+
+
+class JSONArrayAgg(OrderableAggMixin, Aggregate):
+    """
+    JSON array of all values of a subquery. Doesn't add a GROUP BY, so
+    a subquery without rows gives an empty array instead of NULL.
+    """
+
+    contains_aggregate = False
+    function = "JSON_AGG"
+    template = (
+        "COALESCE(%(function)s(%(distinct)s%(expressions)s %(ordering)s), "
+        "'[]')"
+    )
+    output_field = models.JSONField()
+
+
+class JSONText(Func):
+    """
+    JSON value selected as text, which JSONField decodes keeping the key
+    order, where the json type would be decoded by the database driver.
+    """
+
+    template = "(%(expressions)s)::text"
+    output_field = models.JSONField()
+
+
+class DateTimeText(Func):
+    """
+    ISO 8601 text of a datetime in the current time zone, the way DRF
+    DateTimeField renders it.
+    """
+
+    output_field = models.TextField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        tzname = timezone.get_current_timezone_name()
+        local = f"(({sql}) AT TIME ZONE %s)"
+        local_params = (*params, tzname)
+        offset = f"({local} - (({sql}) AT TIME ZONE 'UTC'))"
+        offset_params = (*local_params, *params)
+
+        return (
+            f"REGEXP_REPLACE("
+            f"TO_CHAR({local}, 'YYYY-MM-DD\"T\"HH24:MI:SS.US'), "
+            f"'\\.000000$', '') || "
+            f"CASE WHEN {offset} = INTERVAL '0' THEN 'Z' "
+            f"WHEN {offset} > INTERVAL '0' "
+            f"THEN '+' || TO_CHAR({offset}, 'HH24:MI') "
+            f"ELSE '-' || TO_CHAR(-{offset}, 'HH24:MI') END"
+        ), (*local_params, *offset_params * 4)
@@ -1,6 +1,8 @@
 import datetime
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
 
 from station.models import (
     Crew,
@@ -9,8 +11,11 @@ from station.models import (
     Station,
     Route,
     Trip,
+    TripSchedule,
     Order,
-    Ticket
+    Ticket,
+    SeatHold,
+    TripInventory
 )
 
 
@@ -124,6 +129,21 @@ def sample_trip(**params):
     return Trip.objects.create(**defaults)
 
 
+def sample_trip_schedule(**params):
+    defaults = {
+        "route": sample_route(),
+        "train": sample_train(),
+        "weekdays": [1, 3, 5],
+        "departure_time": datetime.time(hour=22, minute=30),
+        "arrival_time": datetime.time(hour=7, minute=15),
+        "arrival_days": 1,
+        "valid_from": timezone.localdate()
+    }
+    defaults.update(params)
+
+    return TripSchedule.objects.create(**defaults)
+
+
 def sample_order(**params):
     if not params.get("user"):
         user = sample_user()
@@ -152,3 +172,94 @@ def sample_ticket(**params):
     defaults.update(params)
 
     return Ticket.objects.create(**defaults)
+
+
+def sample_seat_hold(**params):
+    defaults = {
+        "cargo": 1,
+        "seat": 1,
+        "expires_at": timezone.now() + datetime.timedelta(minutes=10)
+    }
+    defaults.update(params)
+
+    hold = SeatHold.objects.create(**defaults)
+    TripInventory.objects.record_holds({hold.trip_id: 1})
+    return hold
+
+
+def sample_timetable(stations=200, routes_per_station=5, trips_per_route=20):
+    """
+    Bulk create a synthetic timetable large enough for the query planner
+    to prefer indexes, one trip per route every other day, and analyze it.
+    """
+    train = sample_train()
+    station_list = Station.objects.bulk_create(
+        Station(name=f"Station {number}", latitude=number, longitude=number)
+        for number in range(stations)
+    )
+    route_list = Route.objects.bulk_create(
+        Route(
+            source=source,
+            destination=station_list[(index + shift) % stations],
+            distance=100 * shift
+        )
+        for index, source in enumerate(station_list)
+        for shift in range(1, routes_per_station + 1)
+    )
+    start = timezone.now().replace(hour=6, minute=0, second=0)
+    trips = Trip.objects.bulk_create(
+        (
+            Trip(
+                route=route,
+                train=train,
+                departure_time=start + datetime.timedelta(
+                    days=2 * day, hours=index % 12
+                ),
+                arrival_time=start + datetime.timedelta(
+                    days=2 * day, hours=index % 12 + 6
+                ),
+            )
+            for index, route in enumerate(route_list)
+            for day in range(trips_per_route)
+        ),
+        batch_size=5000
+    )
+    TripInventory.objects.sync()
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    return trips
+
+
+def sample_order_history(trips, users=50, orders_per_user=40, tickets=2):
+    """Bulk create orders with tickets spread over the given trips."""
+    user_list = get_user_model().objects.bulk_create(
+        get_user_model()(email=f"history_{number}@user.com")
+        for number in range(users)
+    )
+    orders = Order.objects.bulk_create(
+        Order(user=user) for user in user_list for _ in range(orders_per_user)
+    )
+    Ticket.objects.bulk_create(
+        (
+            Ticket(
+                trip=trips[index % len(trips)],
+                order=order,
+                cargo=1 + seat // 20,
+                seat=1 + seat % 20,
+            )
+            for index, order in enumerate(orders)
+            for seat in range(
+                index // len(trips) * tickets,
+                (index // len(trips) + 1) * tickets
+            )
+        ),
+        batch_size=5000
+    )
+    TripInventory.objects.sync()
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    return user_list
@@ -3,8 +3,60 @@ from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter,
     OpenApiExample,
+    OpenApiResponse,
 )
 
+from station.serializers.journey_serializers import JourneyQuerySerializer
+from station.serializers.order_serializers import (
+    OrderAutoSerializer,
+    OrderSerializer
+)
+from station.serializers.seat_hold_serializers import SeatHoldSerializer
+from station.serializers.trip_serializers import TripSeatMapSerializer
+
+
+def trip_filter_parameters():
+    return [
+        OpenApiParameter(
+            "from",
+            type=OpenApiTypes.STR,
+            description=(
+                "Filter by from location (source), "
+                "case and accent insensitive"
+            ),
+            examples=[
+                OpenApiExample(name="Example 1", value="Central Station")
+            ]
+        ),
+        OpenApiParameter(
+            "to",
+            type=OpenApiTypes.STR,
+            description=(
+                "Filter by to location (destination), "
+                "case and accent insensitive"
+            ),
+            examples=[
+                OpenApiExample(name="Example 1", value="Union Station")
+            ]
+        ),
+        OpenApiParameter(
+            "departure_time",
+            type=OpenApiTypes.DATE,
+            description="Filter by to departure date",
+            examples=[
+                OpenApiExample(name="Example 1", value="2024-04-01")
+            ]
+        ),
+        OpenApiParameter(
+            "arrival_time",
+            type=OpenApiTypes.DATE,
+            description="Filter by to arrival date",
+            examples=[
+                OpenApiExample(name="Example 1", value="2024-04-02")
+            ]
+        ),
+    ]
+
 
 def trip_list_schema():
     return extend_schema(
@@ -13,65 +65,176 @@ def trip_list_schema():
             "with possibility to filtering by location, "
             "departure and arrival date."
         ),
+        parameters=trip_filter_parameters()
+    )
+
+
+def route_list_schema():
+    return extend_schema(
+        description=(
+            "Endpoint for representation list of routes "
+            "with possibility to filtering by source and destination."
+        ),
         parameters=[
             OpenApiParameter(
-                "from",
+                "source",
                 type=OpenApiTypes.STR,
-                description="Filter by from location (source)",
+                description="Filter by source, case and accent insensitive",
                 examples=[
                     OpenApiExample(name="Example 1", value="Central Station")
                 ]
             ),
             OpenApiParameter(
-                "to",
+                "destination",
                 type=OpenApiTypes.STR,
-                description="Filter by to location (destination)",
+                description=(
+                    "Filter by destination, case and accent insensitive"
+                ),
                 examples=[
                     OpenApiExample(name="Example 1", value="Union Station")
                 ]
             ),
-            OpenApiParameter(
-                "departure_time",
-                type=OpenApiTypes.DATE,
-                description="Filter by to departure date",
-                examples=[
-                    OpenApiExample(name="Example 1", value="2024-04-01")
-                ]
-            ),
-            OpenApiParameter(
-                "arrival_time",
-                type=OpenApiTypes.DATE,
-                description="Filter by to arrival date",
-                examples=[
-                    OpenApiExample(name="Example 1", value="2024-04-02")
-                ]
-            ),
         ]
     )
 
 
-def route_list_schema():
+def station_list_schema():
     return extend_schema(
         description=(
-            "Endpoint for representation list of routes "
-            "with possibility to filtering by source and destination."
+            "Endpoint for representation list of stations "
+            "with possibility of fuzzy search by name."
         ),
         parameters=[
             OpenApiParameter(
-                "source",
+                "name",
                 type=OpenApiTypes.STR,
-                description="Filter by source",
+                description=(
+                    "Search by name, tolerant to case, accents and typos. "
+                    "Results are ordered by similarity"
+                ),
                 examples=[
-                    OpenApiExample(name="Example 1", value="Central Station")
+                    OpenApiExample(name="Example 1", value="Central Statoin")
                 ]
             ),
+        ]
+    )
+
+
+def journey_list_schema():
+    return extend_schema(
+        description=(
+            "Endpoint for planning journeys between two stations "
+            "over upcoming trips, including connections with "
+            "a minimum transfer time and seat availability per leg."
+        ),
+        parameters=[JourneyQuerySerializer],
+    )
+
+
+def trip_detail_schema():
+    return extend_schema(
+        description=(
+            "Endpoint for representation of trip details "
+            "with optional list of taken tickets."
+        ),
+        parameters=[
             OpenApiParameter(
-                "destination",
-                type=OpenApiTypes.STR,
-                description="Filter by destination",
-                examples=[
-                    OpenApiExample(name="Example 1", value="Union Station")
-                ]
+                "taken_tickets",
+                type=OpenApiTypes.BOOL,
+                description=(
+                    "Include taken tickets (true by default). "
+                    "Use the seats endpoint for a compact seat map"
+                ),
             ),
         ]
     )
+
+
+def trip_seats_schema():
+    return extend_schema(
+        description=(
+            "Endpoint for compact seat map of a trip: one base64 bitmap "
+            "of taken and held seats per cargo."
+        ),
+        responses=TripSeatMapSerializer,
+    )
+
+
+def seat_hold_create_schema():
+    return extend_schema(
+        description=(
+            "Endpoint for holding one seat or a list of seats "
+            "during checkout. Holds block the seats for other users "
+            "until they expire or the seats are ordered."
+        ),
+        request=SeatHoldSerializer(many=True),
+        responses=SeatHoldSerializer(many=True),
+    )
+
+
+def order_auto_schema():
+    return extend_schema(
+        description=(
+            "Endpoint for ordering a number of seats on a trip. "
+            "Free seats are picked by the server, next to each other "
+            "in one cargo if possible. Answers 409 Conflict, to be "
+            "retried, while the free seats are locked by other orders."
+        ),
+        request=OrderAutoSerializer,
+        responses=OrderSerializer,
+    )
+
+
+def database_pool_schema():
+    return extend_schema(
+        description=(
+            "Endpoint for staff with the saturation of the connection "
+            "pool, for sizing workers: PgBouncer clients waiting and "
+            "server connections active, or database connections by "
+            "state without PgBouncer."
+        ),
+        responses=OpenApiTypes.OBJECT,
+    )
+
+
+def export_format_parameter():
+    return OpenApiParameter(
+        "export_format",
+        type=OpenApiTypes.STR,
+        enum=["ndjson", "csv"],
+        description="Format of the export, NDJSON by default",
+    )
+
+
+def export_responses():
+    return {
+        (200, "application/x-ndjson"): OpenApiResponse(
+            OpenApiTypes.STR, description="One JSON object per line"
+        ),
+        (200, "text/csv"): OpenApiResponse(
+            OpenApiTypes.STR,
+            description="One row per object, nested values as JSON"
+        ),
+    }
+
+
+def trip_export_schema():
+    return extend_schema(
+        description=(
+            "Endpoint for staff streaming every upcoming trip "
+            "of the list endpoint, with the same filters."
+        ),
+        parameters=[*trip_filter_parameters(), export_format_parameter()],
+        responses=export_responses(),
+    )
+
+
+def order_export_schema():
+    return extend_schema(
+        description=(
+            "Endpoint for staff streaming the orders of all users "
+            "with their tickets."
+        ),
+        parameters=[export_format_parameter()],
+        responses=export_responses(),
+    )
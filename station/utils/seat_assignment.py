@@ -0,0 +1,127 @@
+from collections import defaultdict
+
+from django.db.models import Case, Value, When
+
+from station.models import SeatHold, Ticket, TripCargo
+
+
+class CargosLocked(Exception):
+    """The only cargos with free seats are locked by other bookings."""
+
+
+def get_taken_seats(trip, user=None, cargos=None):
+    """
+    Return seats sold or held by other users as {cargo: {seat, ...}},
+    using a single query.
+    """
+    tickets = Ticket.objects.filter(trip=trip)
+    holds = SeatHold.objects.active().filter(trip=trip)
+    if user is not None:
+        holds = holds.exclude(user=user)
+    if cargos is not None:
+        tickets = tickets.filter(cargo__in=cargos)
+        holds = holds.filter(cargo__in=cargos)
+
+    taken = defaultdict(set)
+    for cargo, seat in (
+        tickets.order_by().values_list("cargo", "seat")
+        .union(holds.order_by().values_list("cargo", "seat"))
+    ):
+        taken[cargo].add(seat)
+    return taken
+
+
+def get_free_seats(places_in_cargo, taken):
+    return [
+        seat for seat in range(1, places_in_cargo + 1) if seat not in taken
+    ]
+
+
+def find_consecutive_seats(free_seats, count):
+    """Return the first run of count consecutive seats or None."""
+    run = []
+    for seat in free_seats:
+        if run and seat != run[-1] + 1:
+            run = []
+        run.append(seat)
+        if len(run) == count:
+            return run
+    return None
+
+
+def lock_cargos(trip, cargos, count):
+    """
+    Lock up to count cargos, in the given order of preference, skipping
+    the ones locked by other transactions, and return their numbers.
+    Fewer are returned when the others are locked.
+    """
+    preference = Case(
+        *[
+            When(number=number, then=Value(position))
+            for position, number in enumerate(cargos)
+        ]
+    )
+    return list(
+        TripCargo.objects
+        .filter(trip=trip, number__in=cargos)
+        .order_by(preference)
+        .select_for_update(skip_locked=True)
+        .values_list("number", flat=True)[:count]
+    )
+
+
+def assign_seats(trip, count, user=None):
+    """
+    Pick count free seats of the trip, next to each other in one cargo
+    if possible. Has to run in a transaction, which keeps the picked
+    cargos locked until the seats are booked. Cargos locked by other
+    transactions are skipped in favor of the remaining ones; fewer seats
+    are returned only when the trip has no more free ones. Raises
+    CargosLocked when the remaining free seats are all in locked cargos.
+    """
+    places_in_cargo = trip.train.places_in_cargo
+    taken = get_taken_seats(trip, user)
+    free = {
+        cargo: get_free_seats(places_in_cargo, taken[cargo])
+        for cargo in range(1, trip.train.cargo_num + 1)
+    }
+
+    def preference(cargo):
+        if find_consecutive_seats(free[cargo], count):
+            return False, len(free[cargo])
+        return True, -len(free[cargo])
+
+    candidates = sorted(
+        (cargo for cargo in free if free[cargo]), key=preference
+    )
+    seats = []
+
+    while candidates and len(seats) < count:
+        needed = count - len(seats)
+        cargos_needed = free_seats_count = 0
+        for cargo in candidates:
+            cargos_needed += 1
+            free_seats_count += len(free[cargo])
+            if free_seats_count >= needed:
+                break
+
+        cargos = lock_cargos(trip, candidates, cargos_needed)
+        if not cargos:
+            raise CargosLocked(
+                f"Cargos {candidates} of trip {trip.id} are locked"
+            )
+        taken = get_taken_seats(trip, user, cargos)
+
+        for cargo in cargos:
+            candidates.remove(cargo)
+            free_seats = get_free_seats(places_in_cargo, taken[cargo])
+            needed = count - len(seats)
+            seats += [
+                (cargo, seat)
+                for seat in (
+                    find_consecutive_seats(free_seats, needed)
+                    or free_seats[:needed]
+                )
+            ]
+
+    return seats
@@ -0,0 +1,35 @@
+import base64
+
+SEAT_MAP_ENCODING = "base64-bitmap"
+
+
+def encode_seat_map(cargo_num, places_in_cargo, seats):
+    """
+    Encode (cargo, seat) pairs as one base64 bitmap per cargo.
+    Bit i (most significant bit first) of cargo bitmap is seat i + 1.
+    """
+    bitmaps = [
+        bytearray((places_in_cargo + 7) // 8) for _ in range(cargo_num)
+    ]
+    for cargo, seat in seats:
+        if 1 <= cargo <= cargo_num and 1 <= seat <= places_in_cargo:
+            bitmaps[cargo - 1][(seat - 1) >> 3] |= 0x80 >> ((seat - 1) & 7)
+
+    return [base64.b64encode(bitmap).decode() for bitmap in bitmaps]
+
+
+def decode_seat_map(places_in_cargo, cargos):
+    """Inverse of encode_seat_map, returns the set of (cargo, seat)."""
+    return {
+        (cargo, seat)
+        for cargo, bitmap in enumerate(cargos, start=1)
+        for seat, byte_bits in enumerate(
+            (
+                (byte >> (7 - bit)) & 1
+                for byte in base64.b64decode(bitmap)
+                for bit in range(8)
+            ),
+            start=1
+        )
+        if byte_bits and seat <= places_in_cargo
+    }
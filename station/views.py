@@ -1,97 +1,179 @@
-from datetime import datetime
+from datetime import timedelta
 
-from django.db.models import F, Count
+from django.conf import settings
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema_view
-from rest_framework import mixins, viewsets
-from rest_framework.permissions import IsAuthenticated
-
-from station.models import Crew, TrainType, Train, Station, Route, Trip, Order
-from station.paginations import OrderPagination
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from station.cache import (
+    CachedListModelMixin,
+    CachedRetrieveModelMixin,
+    ConditionalGetMixin
+)
+from station.export import ExportModelMixin, keyset_rows
+from station.models import (
+    Crew,
+    TrainType,
+    Train,
+    Station,
+    Route,
+    Trip,
+    Order,
+    SeatHold
+)
+from station.paginations import (
+    EstimatedCountPagination,
+    OrderListPagination,
+    TripListPagination
+)
 from station.serializers.crew_serializers import CrewSerializer
+from station.serializers.journey_serializers import (
+    JourneyQuerySerializer,
+    JourneySerializer
+)
 from station.serializers.order_serializers import (
     OrderSerializer,
-    OrderListSerializer
+    OrderListSerializer,
+    OrderAutoSerializer,
+    order_list_payloads
 )
 from station.serializers.route_serializers import (
     RouteSerializer,
     RouteListSerializer,
+    RouteListValuesSerializer,
     RouteDetailSerializer
 )
+from station.serializers.seat_hold_serializers import SeatHoldSerializer
 from station.serializers.station_serializers import StationSerializer
 from station.serializers.train_serializers import TrainSerializer
 from station.serializers.train_type_serializers import TrainTypeSerializer
+from station.serializers.values_serializers import ValuesListModelMixin
 from station.serializers.trip_serializers import (
     TripSerializer,
     TripListSerializer,
-    TripDetailSerializer
+    TripListValuesSerializer,
+    TripDetailSerializer,
+    TripDetailWithoutTicketsSerializer,
+    TripSeatMapSerializer
 )
-from station.utils.schemas import trip_list_schema, route_list_schema
+from station.utils.dates import local_day_range
+from station.utils.db_pool import get_connection_stats
+from station.utils.journey_planner import timetable
+from station.utils.seat_map import SEAT_MAP_ENCODING, encode_seat_map
+from station.utils.schemas import (
+    trip_list_schema,
+    trip_detail_schema,
+    trip_seats_schema,
+    route_list_schema,
+    station_list_schema,
+    journey_list_schema,
+    seat_hold_create_schema,
+    order_auto_schema,
+    order_export_schema,
+    trip_export_schema,
+    database_pool_schema
+)
+from user.authentication import CachedJWTAuthentication
 
 
 class CrewViewSet(
-    mixins.ListModelMixin,
+    CachedListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
 ):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
+    query_budget = {"list": 3}
 
 
 class TrainTypeViewSet(
-    mixins.ListModelMixin,
+    CachedListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
 ):
     queryset = TrainType.objects.all()
     serializer_class = TrainTypeSerializer
+    query_budget = {"list": 3}
 
 
 class TrainViewSet(
-    mixins.ListModelMixin,
+    CachedListModelMixin,
     mixins.CreateModelMixin,
-    mixins.RetrieveModelMixin,
+    CachedRetrieveModelMixin,
     mixins.UpdateModelMixin,
     viewsets.GenericViewSet
 ):
     queryset = Train.objects.all()
     serializer_class = TrainSerializer
+    query_budget = {"list": 3, "retrieve": 2}
 
 
+@extend_schema_view(
+    list=station_list_schema()
+)
 class StationViewSet(
-    mixins.ListModelMixin,
+    CachedListModelMixin,
     mixins.CreateModelMixin,
-    mixins.RetrieveModelMixin,
+    CachedRetrieveModelMixin,
+    ConditionalGetMixin,
     viewsets.GenericViewSet
 ):
     queryset = Station.objects.all()
     serializer_class = StationSerializer
+    query_budget = {"list": 3, "retrieve": 2}
+
+    def get_queryset(self):
+        queryset = self.queryset
+
+        if self.action == "list":
+            if name := self.request.query_params.get("name"):
+                queryset = queryset.search(
+                    name, fuzzy=True
+                ).rank_by_similarity(name)
+
+        return queryset
 
 
 @extend_schema_view(
     list=route_list_schema()
 )
 class RouteViewSet(
-    mixins.ListModelMixin,
+    ConditionalGetMixin,
+    ValuesListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet
 ):
     queryset = Route.objects.select_related("source", "destination")
     serializer_class = RouteSerializer
+    values_serializer_class = RouteListValuesSerializer
+    last_modified_fields = (
+        "updated_at",
+        "source__updated_at",
+        "destination__updated_at"
+    )
+    query_budget = {"list": 5, "retrieve": 2}
+    pagination_class = EstimatedCountPagination
 
     def get_queryset(self):
         queryset = self.queryset
 
         if self.action == "list":
             if source := self.request.query_params.get("source"):
-                queryset = queryset.filter(source__name__icontains=source)
+                queryset = queryset.filter(
+                    source__in=Station.objects.search(source)
+                )
 
             if destination := self.request.query_params.get("destination"):
                 queryset = queryset.filter(
-                    destination__name__icontains=destination
+                    destination__in=Station.objects.search(destination)
                 )
 
-        return queryset.distinct()
+        return queryset
 
     def get_serializer_class(self):
 
@@ -105,54 +187,67 @@ class RouteViewSet(
 
 
 @extend_schema_view(
-    list=trip_list_schema()
+    list=trip_list_schema(),
+    retrieve=trip_detail_schema(),
+    seats=trip_seats_schema(),
+    export=trip_export_schema()
 )
-class TripViewSet(viewsets.ModelViewSet):
+class TripViewSet(
+    ConditionalGetMixin,
+    ExportModelMixin,
+    ValuesListModelMixin,
+    viewsets.ModelViewSet
+):
     queryset = Trip.objects.all()
     serializer_class = TripSerializer
+    values_serializer_class = TripListValuesSerializer
+    last_modified_fields = (
+        "updated_at",
+        "inventory__updated_at",
+        "route__updated_at",
+        "route__source__updated_at",
+        "route__destination__updated_at",
+        "train__updated_at",
+        "train__train_type__updated_at",
+        "crew__updated_at"
+    )
+    expiring_fields = ("departure_time", "holds__expires_at")
+    query_budget = {"list": 4, "retrieve": 4, "seats": 4}
+    pagination_class = TripListPagination
 
     def get_queryset(self):
         queryset = super().get_queryset()
 
-        if self.action == "list":
-            current_time = datetime.now()
+        if self.action in ("list", "export"):
             queryset = (
                 queryset
-                .select_related(
-                    "route__source",
-                    "route__destination",
-                    "train"
-                )
-                .filter(departure_time__gt=current_time)
-                .annotate(
-                    tickets_available=(
-                        F("train__cargo_num")
-                        * F("train__places_in_cargo")
-                        - Count("tickets")
-                    )
-                )
+                .with_tickets_available()
+                .filter(departure_time__gt=timezone.now())
+                .order_by("departure_time", "id")
             )
 
             if from_station := self.request.query_params.get("from"):
                 queryset = queryset.filter(
-                    route__source__name__icontains=from_station
+                    route__source__in=Station.objects.search(from_station)
                 )
 
             if to_station := self.request.query_params.get("to"):
                 queryset = queryset.filter(
-                    route__destination__name__icontains=to_station
+                    route__destination__in=Station.objects.search(to_station)
                 )
 
             if departure := self.request.query_params.get("departure_date"):
-                departure_date = datetime.strptime(departure, "%Y-%m-%d")
+                day_start, day_end = local_day_range(departure)
                 queryset = queryset.filter(
-                    departure_time__date=departure_date
+                    departure_time__gte=day_start,
+                    departure_time__lt=day_end
                 )
 
             if arrival := self.request.query_params.get("arrival_date"):
-                arrival_date = datetime.strptime(arrival, "%Y-%m-%d")
+                day_start, day_end = local_day_range(arrival)
                 queryset = queryset.filter(
-                    arrival_time__date=arrival_date
+                    arrival_time__gte=day_start,
+                    arrival_time__lt=day_end
                 )
 
         if self.action == "retrieve":
@@ -166,41 +261,217 @@ class TripViewSet(viewsets.ModelViewSet):
                 .prefetch_related("crew")
             )
 
-        return queryset.distinct()
+            if self.include_taken_tickets():
+                queryset = queryset.prefetch_related("tickets")
+
+        if self.action == "seats":
+            queryset = queryset.select_related("train")
+
+        return queryset
 
     def get_serializer_class(self):
 
-        if self.action == "list":
+        if self.action in ("list", "export"):
             return TripListSerializer
 
         if self.action == "retrieve":
-            return TripDetailSerializer
+            if self.include_taken_tickets():
+                return TripDetailSerializer
+            return TripDetailWithoutTicketsSerializer
+
+        if self.action == "seats":
+            return TripSeatMapSerializer
 
         return self.serializer_class
 
+    def include_taken_tickets(self):
+        taken_tickets = self.request.query_params.get("taken_tickets")
+        return taken_tickets not in ("false", "0")
+
+    @action(detail=True, methods=["get"])
+    def seats(self, request, pk=None):
+        trip = self.get_object()
+        taken = trip.tickets.order_by().values_list("cargo", "seat")
+        held = (
+            trip.holds
+            .active()
+            .exclude(user_id=request.user.id)
+            .order_by()
+            .values_list("cargo", "seat")
+        )
+
+        serializer = self.get_serializer({
+            "trip": trip.id,
+            "cargo_num": trip.train.cargo_num,
+            "places_in_cargo": trip.train.places_in_cargo,
+            "encoding": SEAT_MAP_ENCODING,
+            "taken": encode_seat_map(
+                trip.train.cargo_num,
+                trip.train.places_in_cargo,
+                taken
+            ),
+            "held": encode_seat_map(
+                trip.train.cargo_num,
+                trip.train.places_in_cargo,
+                held
+            ),
+        })
+        return Response(serializer.data)
 
+
+@extend_schema_view(
+    list=journey_list_schema()
+)
+class JourneyViewSet(viewsets.GenericViewSet):
+    queryset = Trip.objects.with_tickets_available()
+    serializer_class = JourneySerializer
+    query_budget = {"list": 3}
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        query = JourneyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        now = timezone.now()
+
+        plans = timetable.plan(
+            query.validated_data["source"],
+            query.validated_data["destination"],
+            max(query.validated_data.get("departure_after", now), now),
+            min_transfer=timedelta(
+                minutes=query.validated_data["min_transfer"]
+            ),
+            limit=query.validated_data["limit"],
+        )
+
+        trips = self.get_queryset().in_bulk(
+            {leg.trip_id for legs in plans for leg in legs}
+        )
+        journeys = [
+            {
+                "departure_time": legs[0].departure_time,
+                "arrival_time": legs[-1].arrival_time,
+                "transfers": len(legs) - 1,
+                "legs": [trips[leg.trip_id] for leg in legs],
+            }
+            for legs in plans
+            if all(leg.trip_id in trips for leg in legs)
+        ]
+
+        serializer = self.get_serializer(journeys, many=True)
+        return Response(serializer.data)
+
+
+@extend_schema_view(
+    create=seat_hold_create_schema()
+)
+class SeatHoldViewSet(
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet
+):
+    queryset = SeatHold.objects.all()
+    serializer_class = SeatHoldSerializer
+    query_budget = {"list": 3, "create": 9, "destroy": 4}
+    authentication_classes = (CachedJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        queryset = self.queryset.filter(user=self.request.user)
+
+        if self.action == "list":
+            queryset = queryset.active()
+
+        return queryset
+
+    def create(self, request, *args, **kwargs):
+        data = request.data
+        serializer = self.get_serializer(
+            data=data if isinstance(data, list) else [data],
+            many=True
+        )
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def perform_create(self, serializer):
+        serializer.save(
+            user=self.request.user,
+            expires_at=(
+                timezone.now()
+                + timedelta(seconds=settings.SEAT_HOLD_TIMEOUT)
+            )
+        )
+
+    def perform_destroy(self, instance):
+        SeatHold.objects.filter(pk=instance.pk).release()
+
+
+@extend_schema_view(
+    auto=order_auto_schema(),
+    export=order_export_schema()
+)
 class OrderViewSet(
+    ExportModelMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
 ):
-    queryset = Order.objects.prefetch_related(
-        "tickets__trip__route__source",
-        "tickets__trip__route__destination",
-        "tickets__trip__train"
-    )
+    queryset = Order.objects.all()
     serializer_class = OrderSerializer
-    pagination_class = OrderPagination
+    query_budget = {"list": 3, "create": 14, "auto": 17}
+    pagination_class = OrderListPagination
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
+    export_fields = ("id", "user", "tickets", "created_at")
 
     def get_queryset(self):
+        if self.action == "export":
+            return self.queryset
+
         return self.queryset.filter(user=self.request.user)
 
     def get_serializer_class(self):
         if self.action == "list":
             return OrderListSerializer
 
+        if self.action == "auto":
+            return OrderAutoSerializer
+
         return self.serializer_class
 
+    def list(self, request, *args, **kwargs):
+        """Orders rendered by Postgres, see order_list_payloads()."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(order_list_payloads(queryset))
+        return self.get_paginated_response(page)
+
+    def get_export_rows(self, queryset):
+        return keyset_rows(
+            order_list_payloads(queryset, user="user_id"),
+            self.export_chunk_size
+        )
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=["post"])
+    def auto(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order = serializer.save(user=request.user)
+
+        return Response(
+            OrderSerializer(order).data, status=status.HTTP_201_CREATED
+        )
+
+
+@extend_schema_view(
+    get=database_pool_schema()
+)
+class DatabasePoolView(APIView):
+    permission_classes = (IsAdminUser,)
+    query_budget = {"get": 2}
+
+    def get(self, request):
+        return Response(get_connection_stats())
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication
+)
+from rest_framework_simplejwt.settings import api_settings
+
+
+def user_cache_key(user_id):
+    return f"user:authenticated:{user_id}"
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Trusts the signed user_id and is_staff claims of access tokens and
+    returns a TokenUser without a database query. Enough for permission
+    checks; views working with the user row need CachedJWTAuthentication.
+    """
+
+    async def aauthenticate(self, request):
+        return self.authenticate(request)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Loads the user model like JWTAuthentication, but keeps it in the cache
+    for AUTH_USER_CACHE_TIMEOUT seconds. Saving or deleting the user drops
+    the entry, see user.signals.
+    """
+
+    def get_user(self, validated_token):
+        key = user_cache_key(validated_token.get(api_settings.USER_ID_CLAIM))
+
+        if (user := cache.get(key)) is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+
+        return user
+
+
+class ReadClaimsJWTAuthentication(CachedJWTAuthentication):
+    """
+    Default authentication. Reads by non-staff tokens are authenticated
+    from the claims like ClaimsJWTAuthentication, without a query. Writes
+    and staff tokens load the user like CachedJWTAuthentication, so
+    revoked staff rights and deactivated users apply before the token
+    expires.
+    """
+
+    def authenticate(self, request):
+        authenticated = ClaimsJWTAuthentication().authenticate(request)
+        if authenticated is None:
+            return None
+
+        token_user, validated_token = authenticated
+        if request.method in SAFE_METHODS and not token_user.is_staff:
+            return token_user, validated_token
+
+        return self.get_user(validated_token), validated_token
@@ -1,10 +1,18 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework import status
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
 
+from user.authentication import (
+    ClaimsJWTAuthentication,
+    CachedJWTAuthentication,
+    ReadClaimsJWTAuthentication
+)
 
 CREATE_USER_URL = reverse("user:register")
 TOKEN_URL = reverse("user:token_obtain_pair")
@@ -145,3 +153,95 @@ class PrivateUserApiTest(TestCase):
         self.assertEqual(self.user.email, data.get("email"))
         self.assertTrue(self.user.check_password(data.get("password")))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class TokenAuthenticationTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(
+            email="admin@admin.com",
+            password="1234test",
+            is_staff=True
+        )
+
+    def get_request(self, token):
+        return APIRequestFactory().get(
+            "/", headers={"Authorization": f"Bearer {token}"}
+        )
+
+    def test_token_has_is_staff_claim(self):
+        res = self.client.post(
+            TOKEN_URL, {"email": "admin@admin.com", "password": "1234test"}
+        )
+
+        self.assertTrue(AccessToken(res.data["access"])["is_staff"])
+
+    def test_claims_authentication_without_queries(self):
+        res = self.client.post(
+            TOKEN_URL, {"email": "admin@admin.com", "password": "1234test"}
+        )
+        request = self.get_request(res.data["access"])
+
+        with self.assertNumQueries(0):
+            user, _ = ClaimsJWTAuthentication().authenticate(request)
+
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual(user.id, self.user.id)
+        self.assertTrue(user.is_staff)
+
+    def test_cached_authentication(self):
+        request = self.get_request(AccessToken.for_user(self.user))
+        authentication = CachedJWTAuthentication()
+
+        with self.assertNumQueries(1):
+            authentication.authenticate(request)
+        with self.assertNumQueries(0):
+            user, _ = authentication.authenticate(request)
+
+        self.assertEqual(user, self.user)
+
+        self.user.first_name = "updated"
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            user, _ = authentication.authenticate(request)
+        self.assertEqual(user.first_name, "updated")
+
+    def test_read_claims_authentication(self):
+        user = create_user(email="user@user.com", password="1234test")
+        request = self.get_request(AccessToken.for_user(user))
+
+        with self.assertNumQueries(0):
+            token_user, _ = ReadClaimsJWTAuthentication().authenticate(
+                request
+            )
+
+        self.assertIsInstance(token_user, TokenUser)
+
+    def test_revoked_staff_token_loads_user(self):
+        res = self.client.post(
+            TOKEN_URL, {"email": "admin@admin.com", "password": "1234test"}
+        )
+        self.user.is_staff = False
+        self.user.save()
+
+        res = self.client.post(
+            reverse("station:station-list"),
+            {"name": "new_station", "latitude": 1.0, "longitude": 2.0},
+            headers={"Authorization": f"Bearer {res.data['access']}"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_profile_with_token(self):
+        res = self.client.get(
+            ME_URL,
+            headers={
+                "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+            }
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)